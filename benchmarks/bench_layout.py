@@ -0,0 +1,105 @@
+"""
+Compares the month-filter, player-join and player-lookup queries on an
+unsorted player_valuations table, the same table clustered by (date,
+player_id), and the clustered table with an index on player_id. The data
+is generated with DuckDB's range(), so no download is needed.
+
+    python benchmarks/bench_layout.py --rows 20000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import duckdb
+
+MONTH_FILTER_QUERY = """
+    select c.domestic_competition_id, sum(v.market_value), count(*)
+    from player_valuations v
+    join clubs c on v.current_club_id = c.club_id
+    where v.date >= '2020-03-01' and v.date < '2020-04-01'
+    group by all
+"""
+
+PLAYER_JOIN_QUERY = """
+    select v.player_id, count(*), max(v.market_value)
+    from player_valuations v
+    semi join (select player_id from players where player_id % 100 = 0) p
+        on v.player_id = p.player_id
+    group by all
+"""
+
+PLAYER_LOOKUP_QUERY = """
+    select count(*), max(market_value)
+    from player_valuations
+    where player_id = 4242
+"""
+
+QUERIES = {
+    "month filter": MONTH_FILTER_QUERY,
+    "player join": PLAYER_JOIN_QUERY,
+    "player lookup": PLAYER_LOOKUP_QUERY,
+}
+
+
+def _create_data(conn, rows: int, players: int) -> None:
+    conn.execute(f"""
+        create table clubs as
+        select range::integer as club_id, 'C' || (range % 40) as domestic_competition_id
+        from range(1, 1001);
+
+        create table players as
+        select range::integer as player_id from range(1, {players + 1});
+
+        create table valuations_unsorted as
+        select
+            (hash(range) % {players} + 1)::integer as player_id,
+            ('2010-01-01'::date + (hash(range * 7) % 5400)::integer) as date,
+            (hash(range * 13) % 100000000)::float as market_value,
+            (hash(range * 17) % 1000 + 1)::integer as current_club_id
+        from range({rows});
+    """)
+
+
+def _time(conn, query: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(query).fetchall()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--players", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = duckdb.connect(os.path.join(tmp, "bench.duckdb"))
+        _create_data(conn, args.rows, args.players)
+
+        layouts = {
+            "unsorted": "create or replace table player_valuations as select * from valuations_unsorted",
+            "clustered": """
+                create or replace table player_valuations as
+                select * from valuations_unsorted order by date, player_id
+            """,
+            "clustered + index": """
+                create index player_valuations_player_id_idx on player_valuations (player_id)
+            """,
+        }
+
+        print(f"{args.rows:,} valuations, best of {args.repeat}")
+        print(f"{'layout':<20}" + "".join(f"{name:>16}" for name in QUERIES))
+        for layout, ddl in layouts.items():
+            conn.execute(ddl)
+            conn.execute("checkpoint")
+            timings = [_time(conn, query, args.repeat) for query in QUERIES.values()]
+            print(f"{layout:<20}" + "".join(f"{t * 1000:>14.1f}ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
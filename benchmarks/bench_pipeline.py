@@ -0,0 +1,142 @@
+"""
+Materializes the asset graph (raw -> monthly -> DuckDB -> reports) in-process
+on the synthetic dataset and records the wall time and peak memory of every
+asset. Partitioned assets are materialized for all months in a single run.
+
+    python -m benchmarks.bench_pipeline --scale 1 --output bench_1x.json
+
+league_logos is left out because it needs the network; the reports fall
+back to the default logo. Times include Dagster's per-run overhead.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic import generate
+from utils.memory import peak_rss_bytes, reset_peak_rss
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PIPELINE = [
+    "football_competitions_file",
+    "football_clubs_file",
+    "football_players_file",
+    "football_games_file",
+    "football_player_valuations_file",
+    "football_player_appearances_file",
+    "monthly_player_valuations",
+    "monthly_player_appearances",
+    "football_competitions_db",
+    "football_clubs_db",
+    "football_players_db",
+    "football_games_db",
+    "player_valuations_db",
+    "player_appearances_db",
+    "player_valuation_summary_db",
+    "league_valuation_evolution_db",
+    "league_valuation_yearly_db",
+    "club_valuation_evolution_db",
+    "squad_valuation_timeline_db",
+    "first_league_valuation",
+    "top_player_valuations",
+    "player_valuation_stats_to_json",
+]
+
+
+def _prepare_workdir(workdir: str, dataset_dir: str) -> None:
+    """
+    Points the pipeline at the synthetic dataset, a fresh storage root and a
+    fresh database.
+    """
+    from dagster_essentials_football.defs.assets import constants
+
+    storage_root = os.path.join(workdir, "data")
+    default_logo_path = constants.LEAGUE_LOGOS_PATH.format("default")
+    os.makedirs(os.path.dirname(os.path.join(storage_root, default_logo_path)), exist_ok=True)
+    shutil.copy(
+        os.path.join(REPO_ROOT, "data", default_logo_path),
+        os.path.join(storage_root, default_logo_path),
+    )
+
+    os.environ[constants.DATASET_DIR_ENV] = dataset_dir
+    os.environ[constants.STORAGE_ROOT_ENV] = storage_root
+    os.environ["DUCKDB_DATABASE"] = os.path.join(storage_root, "data.duckdb")
+
+
+def run(scale: float, workdir: str) -> list:
+    import dagster as dg
+
+    dataset_dir = os.path.join(workdir, "dataset")
+    start = time.perf_counter()
+    generate(dataset_dir, scale)
+    print(f"generated the {scale:g}x dataset in {time.perf_counter() - start:.1f}s")
+
+    _prepare_workdir(workdir, dataset_dir)
+
+    from dagster_essentials_football.definitions import defs
+
+    definitions = defs()
+    asset_graph = definitions.resolve_asset_graph()
+    assets = list(asset_graph.assets_defs)
+    instance = dg.DagsterInstance.ephemeral()
+
+    results = []
+    for asset_name in PIPELINE:
+        partitions_def = asset_graph.get(dg.AssetKey(asset_name)).partitions_def
+        tags = {}
+        if partitions_def is not None:
+            partition_keys = partitions_def.get_partition_keys()
+            tags = {
+                "dagster/asset_partition_range_start": partition_keys[0],
+                "dagster/asset_partition_range_end": partition_keys[-1],
+            }
+
+        reset_peak_rss()
+        start = time.perf_counter()
+        result = dg.materialize(
+            assets,
+            selection=[asset_name],
+            instance=instance,
+            tags=tags,
+            raise_on_error=False,
+        )
+        results.append({
+            "asset": asset_name,
+            "success": result.success,
+            "seconds": round(time.perf_counter() - start, 3),
+            "peak_rss_mb": round(peak_rss_bytes() / 1024 / 1024, 1),
+        })
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--workdir", help="keep the dataset and database here instead of a temp dir")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+
+    if args.workdir:
+        results = run(args.scale, os.path.abspath(args.workdir))
+    else:
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run(args.scale, workdir)
+
+    print(f"{'asset':<36}{'seconds':>10}{'peak MB':>10}")
+    for result in results:
+        status = "" if result["success"] else "  FAILED"
+        print(f"{result['asset']:<36}{result['seconds']:>10.2f}{result['peak_rss_mb']:>10.1f}{status}")
+
+    if output:
+        with open(output, "w") as f:
+            json.dump({"scale": args.scale, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+Deterministic synthetic version of the Transfermarkt "player-scores" Kaggle
+dataset. It writes the six CSV files the pipeline reads, with the columns of
+`schemas.py` and roughly the cardinalities of the real dataset at scale 1:
+
+    python -m benchmarks.synthetic --scale 10 --output data/synthetic/10x
+
+Every value is derived from DuckDB's hash() of a row number, so the same
+scale always produces byte-identical files. Point FOOTBALL_DATASET_DIR at
+the output directory to run the pipeline on it without Kaggle.
+"""
+import argparse
+import csv
+import os
+
+import duckdb
+
+# Rows at scale 1, close to the Kaggle dataset.
+BASE_ROWS = {
+    "clubs": 450,
+    "players": 32_000,
+    "games": 74_000,
+    "appearances": 1_700_000,
+    "player_valuations": 500_000,
+}
+
+# (competition_id, name, country_name, country_id, cup_id)
+DOMESTIC_LEAGUES = [
+    ("GB1", "premier-league", "England", 189, "FAC"),
+    ("ES1", "laliga", "Spain", 157, "CDR"),
+    ("L1", "bundesliga", "Germany", 40, "DFB"),
+    ("IT1", "serie-a", "Italy", 75, "CIT"),
+    ("FR1", "ligue-1", "France", 50, "FRCH"),
+    ("NL1", "eredivisie", "Netherlands", 122, "NLP"),
+    ("PO1", "liga-portugal", "Portugal", 136, "POCP"),
+    ("BE1", "jupiler-pro-league", "Belgium", 19, "BECP"),
+    ("TR1", "super-lig", "Turkey", 174, "TRP"),
+    ("RU1", "premier-liga", "Russia", 141, "RUP"),
+    ("SC1", "scottish-premiership", "Scotland", 190, "SFA"),
+    ("GR1", "super-league-1", "Greece", 56, "GRP"),
+    ("DK1", "superligaen", "Denmark", 39, "DKP"),
+    ("UKR1", "premier-liga", "Ukraine", 177, "UKRP"),
+]
+
+VALUATIONS_START = "2004-01-01"
+GAMES_START = "2012-07-01"
+DATA_END = "2025-06-30"
+
+FIRST_NAMES = ["Luca", "Mateo", "Noah", "Leon", "Jonas", "Pedro", "Hugo", "Milan", "Ivan", "Kai",
+               "Tom", "Rafael", "Emil", "Ali", "Youssef", "Diego", "Jan", "Sven", "Marco", "Ole"]
+LAST_NAMES = ["Silva", "Müller", "Rossi", "Martin", "Jansen", "Kovac", "Yilmaz", "Santos", "Petrov",
+              "Smith", "Dubois", "Garcia", "Nielsen", "Peeters", "Papadopoulos", "Brown", "Costa",
+              "Schmidt", "Romero", "Ivanov"]
+POSITIONS = {
+    "Goalkeeper": ["Goalkeeper"],
+    "Defender": ["Centre-Back", "Left-Back", "Right-Back"],
+    "Midfield": ["Central Midfield", "Defensive Midfield", "Attacking Midfield"],
+    "Attack": ["Centre-Forward", "Left Winger", "Right Winger"],
+}
+
+
+def _rows(table: str, scale: float) -> int:
+    return max(1, round(BASE_ROWS[table] * scale))
+
+
+def _write_competitions(path: str) -> None:
+    rows = []
+    for competition_id, name, country_name, country_id, cup_id in DOMESTIC_LEAGUES:
+        rows.append([competition_id, name, name, "first_tier", "domestic_league", country_id,
+                     country_name, competition_id, "europa", f"https://www.transfermarkt.com/{name}/startseite/wettbewerb/{competition_id}", "true"])
+        rows.append([cup_id, f"{country_name.lower()}-cup", f"{country_name.lower()}-cup", "domestic_cup", "domestic_cup", country_id,
+                     country_name, competition_id, "europa", f"https://www.transfermarkt.com/pokal/startseite/wettbewerb/{cup_id}", "false"])
+        rows.append([f"{competition_id}SC", f"{country_name.lower()}-super-cup", f"{country_name.lower()}-super-cup", "domestic_super_cup", "other", country_id,
+                     country_name, competition_id, "europa", f"https://www.transfermarkt.com/supercup/startseite/wettbewerb/{competition_id}SC", "false"])
+    rows.append(["CL", "uefa-champions-league", "uefa-champions-league", "uefa_champions_league", "international_cup", -1,
+                 "", "", "europa", "https://www.transfermarkt.com/uefa-champions-league/startseite/pokalwettbewerb/CL", "false"])
+    rows.append(["EL", "europa-league", "europa-league", "uefa_europa_league", "international_cup", -1,
+                 "", "", "europa", "https://www.transfermarkt.com/europa-league/startseite/pokalwettbewerb/EL", "false"])
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "competition_id", "competition_code", "name", "sub_type", "type", "country_id",
+            "country_name", "domestic_league_code", "confederation", "url", "is_major_national_league",
+        ])
+        writer.writerows(rows)
+
+
+def _create_macros(conn, scale: float) -> dict:
+    n_leagues = len(DOMESTIC_LEAGUES)
+    # Every league gets the same number of clubs: club k plays in league (k - 1) % n_leagues.
+    counts = {
+        "clubs": max(1, round(BASE_ROWS["clubs"] * scale / n_leagues)) * n_leagues,
+        "players": _rows("players", scale),
+        "games": _rows("games", scale),
+    }
+    leagues = [league[0] for league in DOMESTIC_LEAGUES]
+    cups = [league[4] for league in DOMESTIC_LEAGUES]
+
+    conn.execute(f"""
+        create macro u(x, salt) as (hash(x, salt) % 1000000) / 1000000.0;
+        create macro pick(n, x, salt) as (hash(x, salt) % n)::integer + 1;
+        create macro pick_from(items, x, salt) as items[pick(len(items), x, salt)];
+
+        create macro club_league(club_id) as {leagues}[(club_id - 1) % {n_leagues} + 1];
+        create macro club_cup(club_id) as {cups}[(club_id - 1) % {n_leagues} + 1];
+        create macro player_club(player_id, year) as pick({counts['clubs']}, player_id, year // 3);
+
+        create macro game_date(g) as
+            '{GAMES_START}'::date + (hash(g, 22) % ('{DATA_END}'::date - '{GAMES_START}'::date))::integer;
+        create macro game_home_club(g) as pick({counts['clubs']}, g, 20);
+        create macro game_away_club(g) as
+            (pick({counts['clubs'] // n_leagues}, g, 21) - 1) * {n_leagues}
+            + (game_home_club(g) - 1) % {n_leagues} + 1;
+        create macro game_is_cup(g) as u(g, 23) < 0.15;
+        create macro game_competition(g) as
+            case when game_is_cup(g) then club_cup(game_home_club(g)) else club_league(game_home_club(g)) end;
+    """)
+    return counts
+
+
+def _copy_csv(conn, query: str, path: str) -> None:
+    conn.execute(f"copy ({query}) to '{path}' (header, delimiter ',')")
+
+
+def generate(output_dir: str, scale: float = 1.0) -> dict:
+    """
+    Writes the synthetic dataset at `scale` (1 = the size of the Kaggle
+    dataset) into `output_dir` and returns the row count of every file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    _write_competitions(os.path.join(output_dir, "competitions.csv"))
+
+    with duckdb.connect() as conn:
+        counts = _create_macros(conn, scale)
+        n_clubs, n_players, n_games = counts["clubs"], counts["players"], counts["games"]
+        n_appearances = _rows("appearances", scale)
+        n_valuations = _rows("player_valuations", scale)
+        sub_positions = [sub for subs in POSITIONS.values() for sub in subs]
+
+        _copy_csv(conn, f"""
+            select
+                range::integer as club_id,
+                'club-' || range as club_code,
+                'Club ' || range as name,
+                club_league(range) as domestic_competition_id,
+                null::bigint as total_market_value,
+                (22 + hash(range, 40) % 14)::smallint as squad_size,
+                round(23 + u(range, 41) * 5, 1) as average_age,
+                (hash(range, 42) % 18)::smallint as foreigners_number,
+                round(u(range, 42) * 70, 1) as foreigners_percentage,
+                (hash(range, 43) % 12)::smallint as national_team_players,
+                'Stadium ' || range as stadium_name,
+                (5000 + hash(range, 44) % 75000)::integer as stadium_seats,
+                '+€' || (hash(range, 45) % 50) || 'm' as net_transfer_record,
+                null::varchar as coach_name,
+                2024::smallint as last_season,
+                'synthetic.csv' as filename,
+                'https://www.transfermarkt.com/club-' || range || '/startseite/verein/' || range as url
+            from range(1, {n_clubs + 1})
+            order by club_id
+        """, os.path.join(output_dir, "clubs.csv"))
+
+        _copy_csv(conn, f"""
+            select
+                range::integer as player_id,
+                pick_from({FIRST_NAMES}, range, 50) as first_name,
+                pick_from({LAST_NAMES}, range, 51) as last_name,
+                first_name || ' ' || last_name as name,
+                2024::smallint as last_season,
+                player_club(range, 2024) as current_club_id,
+                lower(first_name || '-' || last_name) as player_code,
+                pick_from(['Brazil', 'France', 'Spain', 'Germany', 'England', 'Argentina', 'Portugal', 'Netherlands'], range, 52) as country_of_birth,
+                null::varchar as city_of_birth,
+                country_of_birth as country_of_citizenship,
+                ('1975-01-01'::date + (hash(range, 53) % 11700)::integer) as date_of_birth,
+                pick_from({sub_positions}, range, 54) as sub_position,
+                case
+                    when sub_position = 'Goalkeeper' then 'Goalkeeper'
+                    when sub_position like '%Back' then 'Defender'
+                    when sub_position like '%Midfield' then 'Midfield'
+                    else 'Attack'
+                end as position,
+                pick_from(['right', 'right', 'right', 'left', 'both', null], range, 55) as foot,
+                (165 + hash(range, 56) % 36)::smallint as height_in_cm,
+                ('2025-06-30'::date + (365 * (hash(range, 57) % 5))::integer) as contract_expiration_date,
+                null::varchar as agent_name,
+                null::varchar as image_url,
+                'https://www.transfermarkt.com/' || player_code || '/profil/spieler/' || range as url,
+                club_league(current_club_id) as current_club_domestic_competition_id,
+                'Club ' || current_club_id as current_club_name,
+                greatest(25000, round(exp(11.5 + 7.5 * pow(u(range, 12), 3)) / 25000) * 25000)::integer as market_value_in_eur,
+                (market_value_in_eur * (1 + u(range, 58)))::integer as highest_market_value_in_eur
+            from range(1, {n_players + 1})
+            order by player_id
+        """, os.path.join(output_dir, "players.csv"))
+
+        _copy_csv(conn, f"""
+            select
+                range::integer as game_id,
+                game_competition(range) as competition_id,
+                (year(game_date(range)) - (month(game_date(range)) < 7)::integer)::smallint as season,
+                case when game_is_cup(range) then 'Round ' || (1 + hash(range, 24) % 6)
+                     else (1 + hash(range, 24) % 34) || '. Matchday' end as round,
+                game_date(range) as date,
+                game_home_club(range) as home_club_id,
+                game_away_club(range) as away_club_id,
+                (hash(range, 25) % 5)::tinyint as home_club_goals,
+                (hash(range, 26) % 4)::tinyint as away_club_goals,
+                (1 + hash(range, 27) % 20)::smallint as home_club_position,
+                (1 + hash(range, 28) % 20)::smallint as away_club_position,
+                null::varchar as home_club_manager_name,
+                null::varchar as away_club_manager_name,
+                'Stadium ' || game_home_club(range) as stadium,
+                (1000 + hash(range, 29) % 70000)::integer as attendance,
+                null::varchar as referee,
+                'https://www.transfermarkt.com/spielbericht/index/spielbericht/' || range as url,
+                '4-3-3' as home_club_formation,
+                '4-4-2' as away_club_formation,
+                'Club ' || game_home_club(range) as home_club_name,
+                'Club ' || game_away_club(range) as away_club_name,
+                home_club_goals || ':' || away_club_goals as aggregate,
+                case when game_is_cup(range) then 'domestic_cup' else 'domestic_league' end as competition_type
+            from range(1, {n_games + 1})
+            order by game_id
+        """, os.path.join(output_dir, "games.csv"))
+
+        _copy_csv(conn, f"""
+            select
+                game_id || '_' || player_id || '_' || range as appearance_id,
+                game_id,
+                player_id,
+                player_club_id,
+                player_club(player_id, 2024) as player_current_club_id,
+                game_date(game_id) as date,
+                'Player ' || player_id as player_name,
+                game_competition(game_id) as competition_id,
+                (u(range, 32) < 0.15)::tinyint as yellow_cards,
+                (u(range, 33) < 0.005)::tinyint as red_cards,
+                case when u(range, 34) < 0.02 then 2 when u(range, 34) < 0.1 then 1 else 0 end::tinyint as goals,
+                case when u(range, 35) < 0.08 then 1 else 0 end::tinyint as assists,
+                case when u(range, 36) < 0.7 then 90 else 1 + hash(range, 36) % 89 end::smallint as minutes_played
+            from (
+                select
+                    range,
+                    pick({n_games}, range, 30) as game_id,
+                    pick({n_players}, range, 31) as player_id,
+                    case when u(range, 37) < 0.5 then game_home_club(game_id) else game_away_club(game_id) end as player_club_id
+                from range({n_appearances})
+            )
+            order by range
+        """, os.path.join(output_dir, "appearances.csv"))
+
+        _copy_csv(conn, f"""
+            select
+                player_id,
+                date,
+                greatest(
+                    25000,
+                    round(exp(11.5 + 7.5 * pow(u(player_id, 12), 3)) * (0.6 + 0.8 * u(range, 13)) / 25000) * 25000
+                )::integer as market_value_in_eur,
+                player_club(player_id, year(date)) as current_club_id,
+                club_league(current_club_id) as player_club_domestic_competition_id
+            from (
+                select
+                    range,
+                    pick({n_players}, range, 10) as player_id,
+                    '{VALUATIONS_START}'::date
+                        + (hash(range, 11) % ('{DATA_END}'::date - '{VALUATIONS_START}'::date))::integer as date
+                from range({n_valuations})
+            )
+            order by range
+        """, os.path.join(output_dir, "player_valuations.csv"))
+
+    return {
+        "competitions.csv": len(DOMESTIC_LEAGUES) * 3 + 2,
+        "clubs.csv": n_clubs,
+        "players.csv": n_players,
+        "games.csv": n_games,
+        "appearances.csv": n_appearances,
+        "player_valuations.csv": n_valuations,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--output", default="data/synthetic/1x")
+    args = parser.parse_args()
+
+    for file_name, rows in generate(args.output, args.scale).items():
+        print(f"{file_name:<24}{rows:>12,}")
+
+
+if __name__ == "__main__":
+    main()
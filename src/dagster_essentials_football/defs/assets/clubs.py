@@ -1,56 +1,73 @@
 import dagster as dg
 from dagster_duckdb import DuckDBResource
-import matplotlib
-matplotlib.use("Agg")
 
-from dagster_essentials_football.defs.partitions import monthly_partition
+from dagster_essentials_football.defs.partitions import (
+    COMPETITION_SLICE_CLUBS,
+    COMPETITION_SLICE_FILTER,
+    competition_month_slices,
+    monthly_competition_partition,
+    monthly_partition,
+)
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.assets.instrumentation import instrumented
+
+
+def _club_valuation_select(
+    start_date: str,
+    end_date: str,
+    clubs: str = "clubs",
+    slice_filter: str = "",
+) -> str:
+    """
+    Returns the select aggregating the valuations between `start_date` and
+    `end_date` per club and month. The competition partitions pass the clubs
+    of their competitions and a `slice_filter` join keeping only their
+    (month, competition) slices.
+    """
+    return f"""
+        select
+            c.club_id,
+            any_value(c.name) as club_name,
+            sum(v.market_value) as total_valuation,
+            min(v.market_value) as min_valuation,
+            max(v.market_value) as max_valuation,
+            count(v.market_value) as squad_size,
+            any_value(c.domestic_competition_id) as domestic_competition_id,
+            strftime(date_trunc('month', v.date), '%Y-%m-%d') as partition_date
+        from
+            player_valuations v
+        join {clubs} c
+            on v.current_club_id = c.club_id
+        {slice_filter}
+        where v.date >= '{start_date}'
+            and v.date < '{end_date}'
+        group by
+            c.club_id,
+            date_trunc('month', v.date)
+    """
 
 
 @dg.asset(
         partitions_def=monthly_partition,
+        deps=["player_valuations_db",
+              "football_clubs_db"],
         group_name="persisted",
+        pool=constants.DUCKDB_WRITER_POOL,
+        backfill_policy=dg.BackfillPolicy.single_run(),
 )
+@instrumented
 def club_valuation_evolution_db(
     context: dg.AssetExecutionContext,
     database: DuckDBResource,
-):
+) -> None:
     """
     calculates and stores club valuation evolution of clubs in the database.
     """
-    monthly_partition = context.partition_key
+    partition_keys = context.partition_keys
+    time_window = context.partition_time_window
     query = f"""
-        select
-            c.name as club_name,
-            v.market_value,
-            v.domestic_competition_id,
-        from
-            player_valuations v
-        join clubs c
-            on v.current_club_id = c.club_id
-        where v.date >= '{monthly_partition}'
-            and v.date < '{monthly_partition}'::date + interval '1 month'
-        """
-    
-    with database.get_connection() as conn:
-        result = conn.execute(query).fetch_df()
-
-    if result.empty:
-        return
-    
-
-    monthly_club_valuations = result.groupby('club_name').agg(
-        club_name=('club_name', 'first'),
-        total_valuation=('market_value', 'sum'),
-        min_valuation=('market_value', 'min'),
-        max_valuation=('market_value', 'max'),
-        squad_size=('market_value', 'count'),
-        domestic_competition_id=('domestic_competition_id', 'first')
-    )
-    
-    monthly_club_valuations['partition_date'] = monthly_partition
-
-    query_insert = f"""
         create table if not exists club_valuation_evolution (
+            club_id integer,
             club_name varchar,
             total_valuation float,
             min_valuation float,
@@ -60,19 +77,190 @@ def club_valuation_evolution_db(
             partition_date varchar
         );
 
-        delete from club_valuation_evolution where partition_date = '{monthly_partition}';
-
-        insert into club_valuation_evolution 
-        values (
-            '{monthly_club_valuations['club_name']}',
-            {monthly_club_valuations['total_valuation']},
-            {monthly_club_valuations['min_valuation']},
-            {monthly_club_valuations['max_valuation']},
-            {monthly_club_valuations['squad_size']},
-            '{monthly_club_valuations['domestic_competition_id']}',
-            '{monthly_partition}'
+        begin transaction;
+
+        delete from club_valuation_evolution
+        where partition_date between '{partition_keys[0]}' and '{partition_keys[-1]}';
+
+        insert into club_valuation_evolution (
+            club_id,
+            club_name,
+            total_valuation,
+            min_valuation,
+            max_valuation,
+            squad_size,
+            domestic_competition_id,
+            partition_date
+        )
+        {_club_valuation_select(
+            time_window.start.strftime(constants.DATE_FORMAT),
+            time_window.end.strftime(constants.DATE_FORMAT),
+        )};
+
+        commit;
+    """
+
+    with database.get_connection() as conn:
+        conn.execute(query)
+
+
+@dg.asset(
+        partitions_def=monthly_competition_partition,
+        deps=["player_valuations_db",
+              "football_clubs_db"],
+        group_name="persisted",
+        pool=constants.DUCKDB_WRITER_POOL,
+)
+@instrumented
+def club_competition_valuation_db(
+    context: dg.AssetExecutionContext,
+    database: DuckDBResource,
+) -> None:
+    """
+    calculates the club valuation evolution per month and domestic competition,
+    so a correction for one league only recomputes the clubs of that league.
+    """
+    values, start_date, end_date = competition_month_slices(context.partition_keys)
+    query = f"""
+        create table if not exists club_competition_valuation_evolution (
+            club_id integer,
+            club_name varchar,
+            total_valuation float,
+            min_valuation float,
+            max_valuation float,
+            squad_size integer,
+            domestic_competition_id varchar,
+            partition_date varchar
         );
+
+        create or replace temp table partition_slices as
+        select * from (values {values}) as s(partition_date, domestic_competition_id);
+
+        begin transaction;
+
+        delete from club_competition_valuation_evolution as e
+        using partition_slices as s
+        where e.partition_date = s.partition_date
+            and e.domestic_competition_id = s.domestic_competition_id;
+
+        insert into club_competition_valuation_evolution (
+            club_id,
+            club_name,
+            total_valuation,
+            min_valuation,
+            max_valuation,
+            squad_size,
+            domestic_competition_id,
+            partition_date
+        )
+        {_club_valuation_select(
+            start_date,
+            end_date,
+            clubs=COMPETITION_SLICE_CLUBS,
+            slice_filter=COMPETITION_SLICE_FILTER,
+        )};
+
+        commit;
+    """
+
+    with database.get_connection() as conn:
+        conn.execute(query)
+
+
+@dg.asset(
+        partitions_def=monthly_partition,
+        deps=["player_valuations_db",
+              "football_clubs_db"],
+        group_name="persisted",
+        pool=constants.DUCKDB_WRITER_POOL,
+        backfill_policy=dg.BackfillPolicy.single_run(),
+)
+@instrumented
+def squad_valuation_timeline_db(
+    context: dg.AssetExecutionContext,
+    database: DuckDBResource,
+) -> None:
+    """
+    calculates the squad valuation of every club at the end of each month,
+    using each player's latest valuation as of that date (ASOF join) instead
+    of only the valuations recorded inside the month. All requested months
+    are computed in one query.
+    """
+    partition_keys = context.partition_keys
+    time_window = context.partition_time_window
+    start_date = time_window.start.strftime(constants.DATE_FORMAT)
+    end_date = time_window.end.strftime(constants.DATE_FORMAT)
+    staleness = constants.VALUATION_STALENESS_MONTHS
+
+    query = f"""
+        create table if not exists squad_valuation_timeline (
+            club_id integer,
+            club_name varchar,
+            domestic_competition_id varchar,
+            total_valuation double,
+            player_count integer,
+            partition_date varchar
+        );
+
+        create or replace view league_squad_valuation_timeline as
+        select
+            domestic_competition_id,
+            partition_date,
+            sum(total_valuation) as total_valuation,
+            sum(player_count) as player_count
+        from squad_valuation_timeline
+        group by
+            domestic_competition_id,
+            partition_date;
+
+        begin transaction;
+
+        delete from squad_valuation_timeline
+        where partition_date between '{partition_keys[0]}' and '{partition_keys[-1]}';
+
+        insert into squad_valuation_timeline
+        with month_ends as (
+            select
+                month_start,
+                month_start + interval 1 month as month_end
+            from range('{start_date}'::timestamp, '{end_date}'::timestamp, interval 1 month) as t(month_start)
+        ),
+        squad_players as (
+            select distinct player_id
+            from player_valuations
+            where date < '{end_date}'
+                and date >= '{start_date}'::date - interval {staleness} month
+        ),
+        player_months as (
+            select * from squad_players cross join month_ends
+        ),
+        latest_valuations as (
+            select
+                pm.month_start,
+                v.current_club_id,
+                v.market_value
+            from player_months pm
+            asof join player_valuations v
+                on pm.player_id = v.player_id
+                and pm.month_end > v.date
+            where v.date >= pm.month_end - interval {staleness} month
+        )
+        select
+            c.club_id,
+            any_value(c.name) as club_name,
+            any_value(c.domestic_competition_id) as domestic_competition_id,
+            sum(lv.market_value) as total_valuation,
+            count(*) as player_count,
+            strftime(lv.month_start, '%Y-%m-%d') as partition_date
+        from latest_valuations lv
+        join clubs c
+            on lv.current_club_id = c.club_id
+        group by
+            c.club_id,
+            lv.month_start;
+
+        commit;
     """
 
     with database.get_connection() as conn:
-        conn.execute(query_insert)
\ No newline at end of file
+        conn.execute(query)
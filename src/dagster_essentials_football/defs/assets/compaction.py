@@ -0,0 +1,152 @@
+from datetime import datetime
+import json
+import os
+import shutil
+import tempfile
+import uuid
+
+import dagster as dg
+
+from dagster_essentials_football.defs.assets import constants, instrumentation
+from dagster_essentials_football.defs.assets.football import (
+    COMPACTED_MANIFEST,
+    _read_months_sql,
+    compacted_versions,
+    partition_files_lock,
+)
+from dagster_essentials_football.defs.assets.instrumentation import instrumented
+from dagster_essentials_football.defs.partitions import monthly_partition
+from dagster_essentials_football.defs.storage import StorageResource
+
+
+def _write_manifest(compacted_path: str, versions: dict) -> None:
+    """
+    Switches the compacted dataset to `versions` with a single rename.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{COMPACTED_MANIFEST}.", dir=compacted_path)
+    with os.fdopen(fd, "w") as f:
+        json.dump(versions, f, sort_keys=True)
+    os.replace(tmp_path, os.path.join(compacted_path, COMPACTED_MANIFEST))
+
+
+def _compact_closed_years(
+    table_name: str,
+    partition_file_path: str,
+    compacted_path: str,
+) -> dg.MaterializeResult:
+    """
+    Rolls the monthly Parquet files of every closed year into the
+    `year=/month=` hive layout under `compacted_path`, one well-sized file
+    per month sorted by the table's cluster keys, and removes the monthly
+    files it folded in. Years without new monthly files are left untouched,
+    and a month split again after compaction is merged back on the next run.
+
+    Every compaction of a year is written to a new version directory, and
+    the manifest (see `compacted_versions`) is switched to it in one rename,
+    so readers see either the old or the new year, never a missing one. The
+    whole run holds the lock of the monthly files (`partition_files_lock`).
+    """
+    current_year = datetime.now().year
+    months_by_year = {}
+    for partition_key in monthly_partition.get_partition_keys():
+        year = int(partition_key[:4])
+        if year < current_year:
+            months_by_year.setdefault(year, []).append(partition_key[:-3])
+
+    compacted_years = []
+    removed_files = 0
+
+    os.makedirs(compacted_path, exist_ok=True)
+    with partition_files_lock(partition_file_path), \
+            instrumentation.connect(config={"memory_limit": constants.INGEST_MEMORY_LIMIT}) as conn:
+        versions = compacted_versions(compacted_path)
+
+        # Versions left behind by an interrupted run are not in the manifest.
+        for entry in os.listdir(compacted_path):
+            if os.path.isdir(os.path.join(compacted_path, entry)) and entry not in versions.values():
+                shutil.rmtree(os.path.join(compacted_path, entry))
+
+        for year, months in months_by_year.items():
+            month_files = [
+                partition_file_path.format(month) for month in months
+                if os.path.exists(partition_file_path.format(month))
+            ]
+            if not month_files:
+                continue
+
+            if str(year) not in versions:
+                months = [month for month in months if partition_file_path.format(month) in month_files]
+
+            version = f"{year}-{uuid.uuid4().hex}"
+            version_path = os.path.join(compacted_path, version)
+            conn.execute(f"""
+                copy (
+                    select *, year(date) as year, month(date) as month
+                    from {_read_months_sql(months, partition_file_path, compacted_path)}
+                    order by {constants.CLUSTER_KEYS[table_name]}
+                ) to '{version_path}' (
+                    format parquet,
+                    partition_by (year, month),
+                    compression zstd,
+                    row_group_size {constants.COMPACTED_ROW_GROUP_SIZE}
+                );
+            """)
+
+            if not os.path.isdir(os.path.join(version_path, f"year={year}")):
+                # A year without rows keeps its (empty) monthly files.
+                shutil.rmtree(version_path, ignore_errors=True)
+                continue
+
+            previous_version = versions.get(str(year))
+            versions[str(year)] = version
+            _write_manifest(compacted_path, versions)
+
+            for month_file in month_files:
+                os.remove(month_file)
+            if previous_version:
+                shutil.rmtree(os.path.join(compacted_path, previous_version), ignore_errors=True)
+            compacted_years.append(year)
+            removed_files += len(month_files)
+
+    return dg.MaterializeResult(
+        metadata={
+            "compacted_years": dg.MetadataValue.json(compacted_years),
+            "removed_monthly_files": removed_files,
+        }
+    )
+
+
+@dg.asset(
+    deps=["monthly_player_valuations"],
+    group_name="partitioned_files",
+    pool=constants.DUCKDB_WRITER_POOL,
+)
+@instrumented
+def compacted_player_valuations(storage: StorageResource) -> dg.MaterializeResult:
+    """
+    Compacts the monthly valuation files of closed years into a
+    hive-partitioned Parquet dataset.
+    """
+    return _compact_closed_years(
+        "player_valuations",
+        storage.path(constants.PLAYER_VALUATIONS_FILE_PATH),
+        storage.path(constants.COMPACTED_PLAYER_VALUATIONS_PATH),
+    )
+
+
+@dg.asset(
+    deps=["monthly_player_appearances"],
+    group_name="partitioned_files",
+    pool=constants.DUCKDB_WRITER_POOL,
+)
+@instrumented
+def compacted_player_appearances(storage: StorageResource) -> dg.MaterializeResult:
+    """
+    Compacts the monthly appearance files of closed years into a
+    hive-partitioned Parquet dataset.
+    """
+    return _compact_closed_years(
+        "player_appearances",
+        storage.path(constants.PLAYER_APPEARANCES_FILE_PATH),
+        storage.path(constants.COMPACTED_PLAYER_APPEARANCES_PATH),
+    )
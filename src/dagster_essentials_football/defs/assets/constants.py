@@ -1,22 +1,79 @@
-RAW_PLAYER_VALUATIONS_FILE_PATH = "data/raw/player_valuations.parquet"
-RAW_PLAYER_APPEARANCES_FILE_PATH = "data/raw/player_appearcances.parquet"
-PLAYER_VALUATIONS_FILE_PATH = "data/raw/valuation_partitions/valuations_{}.parquet"
-PLAYER_APPEARANCES_FILE_PATH = "data/raw/appearcance_partitions/appearcances_{}.parquet"
-PLAYERS_FILE_PATH = "data/raw/players.parquet"
-CLUBS_FILE_PATH = "data/raw/clubs.parquet"
-GAMES_FILE_PATH = "data/raw/games.parquet"
-COMPETITIONS_FILE_PATH = "data/raw/competitions.parquet"
+KAGGLE_DATASET = "davidcariboo/player-scores"
+# A directory with the dataset's CSV files; when set, Kaggle is not contacted.
+DATASET_DIR_ENV = "FOOTBALL_DATASET_DIR"
+# Set to 1 to attach DuckDB's profile of every statement to the materializations.
+DUCKDB_PROFILE_ENV = "FOOTBALL_DUCKDB_PROFILE"
+# The directory all files below are stored under (StorageResource); the
+# paths are relative to it.
+STORAGE_ROOT_ENV = "FOOTBALL_STORAGE_ROOT"
+# Where the Arrow IO manager stores the tables assets hand to each other.
+ARROW_STORAGE_PATH = "storage"
 
-LEAGUE_LOGOS_PATH = "data/logos/leagues/{}.png"
+RAW_PLAYER_VALUATIONS_FILE_PATH = "raw/player_valuations.parquet"
+RAW_PLAYER_APPEARANCES_FILE_PATH = "raw/player_appearcances.parquet"
+PLAYER_VALUATIONS_FILE_PATH = "raw/valuation_partitions/valuations_{}.parquet"
+PLAYER_APPEARANCES_FILE_PATH = "raw/appearcance_partitions/appearcances_{}.parquet"
+COMPACTED_PLAYER_VALUATIONS_PATH = "raw/valuations_compacted"
+COMPACTED_PLAYER_APPEARANCES_PATH = "raw/appearances_compacted"
+PLAYERS_FILE_PATH = "raw/players.parquet"
+CLUBS_FILE_PATH = "raw/clubs.parquet"
+GAMES_FILE_PATH = "raw/games.parquet"
+COMPETITIONS_FILE_PATH = "raw/competitions.parquet"
 
-TRIPS_BY_AIRPORT_FILE_PATH = "data/outputs/trips_by_airport.csv"
-TRIPS_BY_WEEK_FILE_PATH = "data/outputs/trips_by_week.csv"
-MANHATTAN_STATS_FILE_PATH = "data/staging/manhattan_stats.geojson"
-MANHATTAN_MAP_FILE_PATH = "data/outputs/manhattan_map.png"
+LEAGUE_LOGOS_PATH = "logos/leagues/{}.png"
+LOGO_MAX_WORKERS = 8
+LOGO_REQUEST_TIMEOUT = 10
+# Logos are decoded and scaled to this height once per process and kept in
+# memory; the least recently used ones are dropped beyond the cache size.
+LOGO_HEIGHT_PX = 40
+LOGO_CACHE_SIZE = 64
 
-REQUEST_DESTINATION_TEMPLATE_FILE_PATH = "data/outputs/{}.png"
+CHART_OUTPUT_PATH = "outputs/{}.png"
+# Materializations embed thumbnails of the charts and link the full images.
+THUMBNAIL_SIZE = (480, 480)
+THUMBNAIL_COLORS = 64
+# Worker processes drawing the charts of one report in parallel. Starting the
+# pool costs about as much as importing the plotting stack (~1-2s), more than
+# the two ~0.3s league charts take inline, so they are drawn in-process.
+CHART_RENDER_WORKERS = 1
+
+HTTP_CACHE_PATH = "cache/http"
+HTTP_CACHE_TTL = 7 * 24 * 60 * 60
+HTTP_CACHE_MAX_BYTES = 50_000_000
+
+TRIPS_BY_AIRPORT_FILE_PATH = "outputs/trips_by_airport.csv"
+TRIPS_BY_WEEK_FILE_PATH = "outputs/trips_by_week.csv"
+MANHATTAN_STATS_FILE_PATH = "staging/manhattan_stats.geojson"
+MANHATTAN_MAP_FILE_PATH = "outputs/manhattan_map.png"
+
+REQUEST_DESTINATION_TEMPLATE_FILE_PATH = "outputs/{}.png"
 
 DATE_FORMAT = "%Y-%m-%d"
 
+RAW_ROW_GROUP_SIZE = 100_000
+INGEST_MEMORY_LIMIT = "1GB"
+COMPACTED_ROW_GROUP_SIZE = 122_880
+
+# Valuations older than this are not counted in a squad as of month end.
+VALUATION_STALENESS_MONTHS = 12
+
+# Assets writing to DuckDB share this pool; its limit caps how many of them
+# wait on the writer lock at once.
+DUCKDB_WRITER_POOL = "duckdb_writer"
+
+# Fact tables are kept in this order so the zone maps prune month filters.
+CLUSTER_KEYS = {
+    "player_valuations": "date, player_id",
+    "player_appearances": "date, player_id",
+}
+# ART indexes only serve point lookups on these columns, not hash joins.
+INDEXED_COLUMNS = {
+    "player_valuations": ["player_id"],
+    "player_appearances": ["player_id"],
+}
+
+# Results kept by the dashboard query API (query_api.WarehouseQueries).
+QUERY_CACHE_SIZE = 256
+
 START_DATE = "2015-01-01"
 END_DATE = "2026-01-01"
@@ -0,0 +1,194 @@
+import dagster as dg
+from dagster_duckdb import DuckDBResource
+
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.assets.football import _read_months_sql, partition_files_lock
+from dagster_essentials_football.defs.assets.instrumentation import instrumented
+from dagster_essentials_football.defs.partitions import monthly_partition
+from dagster_essentials_football.defs.storage import StorageResource
+
+FINGERPRINTED_FILES = {
+    "player_valuations": constants.RAW_PLAYER_VALUATIONS_FILE_PATH,
+    "player_appearances": constants.RAW_PLAYER_APPEARANCES_FILE_PATH,
+}
+
+
+def _create_fingerprint_tables(conn) -> None:
+    for table_name in ["month_fingerprints", "rebuilt_month_fingerprints"]:
+        conn.execute(f"""
+            create table if not exists {table_name} (
+                dataset varchar,
+                partition_date varchar,
+                row_count bigint,
+                content_hash hugeint
+            );
+        """)
+
+
+def _fingerprints_sql(source: str) -> str:
+    return f"""
+        select
+            strftime(date, '%Y-%m-01') as partition_date,
+            count(*) as row_count,
+            sum(hash(r)) as content_hash
+        from {source} as r
+        where date >= '{constants.START_DATE}'
+            and date < '{constants.END_DATE}'
+        group by
+            partition_date
+    """
+
+
+def _changed_partitions(conn, dataset: str) -> list:
+    """
+    The months of `dataset` whose raw fingerprint differs from the one they
+    had when they were last rebuilt.
+    """
+    return [row[0] for row in conn.execute(f"""
+        select coalesce(n.partition_date, o.partition_date) as partition_date
+        from (
+            select * from month_fingerprints where dataset = '{dataset}'
+        ) as n
+        full outer join (
+            select * from rebuilt_month_fingerprints where dataset = '{dataset}'
+        ) as o
+            on n.partition_date = o.partition_date
+        where n.row_count is distinct from o.row_count
+            or n.content_hash is distinct from o.content_hash
+        order by partition_date;
+    """).fetchall()]
+
+
+def _record_rebuilt_fingerprints(
+    database: DuckDBResource,
+    dataset: str,
+    months: list,
+    partition_file_path: str,
+    compacted_path: str,
+) -> int:
+    """
+    Records the fingerprints of the months a run rebuilt, computed from the
+    monthly files it loaded. The fingerprints are only recorded by the last
+    asset of the rebuild jobs, so a month whose rebuild failed keeps its old
+    fingerprint and is requested again after the next fingerprint run.
+    """
+    with partition_files_lock(partition_file_path):
+        source = _read_months_sql(months, partition_file_path, compacted_path)
+        with database.get_connection() as conn:
+            _create_fingerprint_tables(conn)
+            conn.execute(f"""
+                begin transaction;
+
+                delete from rebuilt_month_fingerprints
+                where dataset = '{dataset}'
+                    and partition_date between '{months[0]}-01' and '{months[-1]}-01';
+
+                insert into rebuilt_month_fingerprints
+                select '{dataset}', partition_date, row_count, content_hash
+                from ({_fingerprints_sql(source)});
+
+                commit;
+            """)
+    return len(months)
+
+
+@dg.asset(
+    deps=["football_player_valuations_file",
+          "football_player_appearances_file"],
+    group_name="partitioned_files",
+    pool=constants.DUCKDB_WRITER_POOL,
+)
+@instrumented
+def month_fingerprints_db(
+    database: DuckDBResource,
+    storage: StorageResource,
+) -> dg.MaterializeResult:
+    """
+    Computes a fingerprint (row count and hash aggregate) per month of the raw
+    valuations and appearances in one scan of each file, stores it, and reports
+    the months whose fingerprint differs from the one of their last successful
+    rebuild (see `_record_rebuilt_fingerprints`).
+    """
+    metadata = {}
+
+    with database.get_connection() as conn:
+        _create_fingerprint_tables(conn)
+
+        for dataset, file_path in FINGERPRINTED_FILES.items():
+            conn.execute(f"""
+                begin transaction;
+
+                delete from month_fingerprints where dataset = '{dataset}';
+
+                insert into month_fingerprints
+                select '{dataset}', partition_date, row_count, content_hash
+                from ({_fingerprints_sql(f"read_parquet('{storage.path(file_path)}')")});
+
+                commit;
+            """)
+
+            changed_partitions = _changed_partitions(conn, dataset)
+            metadata[f"{dataset}_changed_partitions"] = dg.MetadataValue.json(changed_partitions)
+            metadata[f"{dataset}_changed_count"] = len(changed_partitions)
+
+    return dg.MaterializeResult(metadata=metadata)
+
+
+@dg.asset(
+    partitions_def=monthly_partition,
+    deps=["player_valuation_summary_db",
+          "league_valuation_evolution_db",
+          "league_valuation_yearly_db",
+          "club_valuation_evolution_db",
+          "squad_valuation_timeline_db"],
+    group_name="partitioned_files",
+    pool=constants.DUCKDB_WRITER_POOL,
+    backfill_policy=dg.BackfillPolicy.single_run(),
+)
+@instrumented
+def rebuilt_valuation_fingerprints_db(
+    context: dg.AssetExecutionContext,
+    database: DuckDBResource,
+    storage: StorageResource,
+) -> dg.MaterializeResult:
+    """
+    Marks the requested months of the valuations as rebuilt once all of their
+    downstream assets succeeded.
+    """
+    months = [partition_key[:-3] for partition_key in context.partition_keys]
+    recorded = _record_rebuilt_fingerprints(
+        database,
+        "player_valuations",
+        months,
+        storage.path(constants.PLAYER_VALUATIONS_FILE_PATH),
+        storage.path(constants.COMPACTED_PLAYER_VALUATIONS_PATH),
+    )
+    return dg.MaterializeResult(metadata={"recorded_months": recorded})
+
+
+@dg.asset(
+    partitions_def=monthly_partition,
+    deps=["player_appearances_db"],
+    group_name="partitioned_files",
+    pool=constants.DUCKDB_WRITER_POOL,
+    backfill_policy=dg.BackfillPolicy.single_run(),
+)
+@instrumented
+def rebuilt_appearance_fingerprints_db(
+    context: dg.AssetExecutionContext,
+    database: DuckDBResource,
+    storage: StorageResource,
+) -> dg.MaterializeResult:
+    """
+    Marks the requested months of the appearances as rebuilt once they are
+    loaded.
+    """
+    months = [partition_key[:-3] for partition_key in context.partition_keys]
+    recorded = _record_rebuilt_fingerprints(
+        database,
+        "player_appearances",
+        months,
+        storage.path(constants.PLAYER_APPEARANCES_FILE_PATH),
+        storage.path(constants.COMPACTED_PLAYER_APPEARANCES_PATH),
+    )
+    return dg.MaterializeResult(metadata={"recorded_months": recorded})
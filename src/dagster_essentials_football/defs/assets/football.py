@@ -1,314 +1,620 @@
-from io import BytesIO
 import dagster as dg
-import requests
-from dagster_essentials_football.defs.assets import constants
-from dagster_essentials_football.defs.partitions import monthly_partition
-import kagglehub
-from kagglehub import KaggleDatasetAdapter
-import pandas as pd
+from dagster_essentials_football.defs.assets import constants, instrumentation, schemas
+from dagster_essentials_football.defs.assets.instrumentation import instrumented
+from dagster_essentials_football.defs.partitions import domestic_competition_partition, monthly_partition
+from dagster_essentials_football.defs.resources import _exclusive_file_lock
+from dagster_essentials_football.defs.storage import StorageResource
 from dagster_duckdb import DuckDBResource
-from bs4 import BeautifulSoup
+import hashlib
+import json
 import os
+import re
+import shutil
+import tempfile
+
+DATA_VERSION_TAG = "dagster/data_version"
+COMPACTED_MANIFEST = "manifest.json"
+
+PLAYER_VALUATION_CHANGES_DDL = """
+    create table if not exists player_valuation_changes (
+        player_id integer
+    );
+"""
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ingest_version(csv_hash: str, schema: dict, copy_options: dict) -> str:
+    """
+    The data version of an ingested Parquet file: the CSV's content hash
+    combined with everything that shapes the file written from it.
+    """
+    digest = hashlib.sha256(csv_hash.encode())
+    digest.update(json.dumps({"schema": schema, "copy_options": copy_options}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _latest_data_version(context: dg.AssetExecutionContext):
+    event = context.instance.get_latest_materialization_event(context.asset_key)
+    if event is None or event.asset_materialization is None:
+        return None
+    return event.asset_materialization.tags.get(DATA_VERSION_TAG)
+
+
+def _ingest_csv(
+    context: dg.AssetExecutionContext,
+    file_name: str,
+    schema: dict,
+    parquet_path: str,
+    order_by: str = "",
+) -> dg.MaterializeResult:
+    """
+    Downloads a CSV file of the Kaggle dataset and converts it to Parquet in
+    bounded-memory batches, typed with its explicit schema. When the
+    FOOTBALL_DATASET_DIR environment variable is set, the CSV file is read
+    from that directory instead, e.g. for the synthetic benchmark dataset.
+
+    kagglehub only downloads a dataset version that is not cached yet. The
+    content hash of the CSV, the schema and the COPY options are recorded as
+    data version, and the Parquet file is not rewritten while none of them
+    changed, so downstream assets stay fresh.
+    """
+    dataset_dir = os.environ.get(constants.DATASET_DIR_ENV)
+    if dataset_dir:
+        csv_path = os.path.join(dataset_dir, file_name)
+    else:
+        import kagglehub
+
+        csv_path = kagglehub.dataset_download(constants.KAGGLE_DATASET, path=file_name)
+    copy_options = {
+        "order_by": order_by,
+        "compression": "zstd",
+        "row_group_size": constants.RAW_ROW_GROUP_SIZE,
+    }
+    data_version = _ingest_version(_file_hash(csv_path), schema, copy_options)
+    dataset_version = re.search(r"versions/(\d+)", csv_path)
+    metadata = {
+        "dataset_version": dataset_version.group(1) if dataset_version else "unknown",
+    }
+
+    if os.path.exists(parquet_path) and _latest_data_version(context) == data_version:
+        context.log.info(f"{file_name} is unchanged, skipping the Parquet rewrite.")
+        return dg.MaterializeResult(
+            data_version=dg.DataVersion(data_version),
+            metadata={**metadata, "skipped": True},
+        )
+
+    order_clause = f"order by {copy_options['order_by']}" if copy_options["order_by"] else ""
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+
+    config = {
+        "memory_limit": constants.INGEST_MEMORY_LIMIT,
+        "preserve_insertion_order": False,
+    }
+    with instrumentation.connect(config=config) as conn:
+        conn.execute(f"""
+            copy (
+                select *
+                from read_csv('{csv_path}', header = true, types = {schema})
+                {order_clause}
+            ) to '{parquet_path}' (
+                format parquet,
+                compression {copy_options['compression']},
+                row_group_size {copy_options['row_group_size']}
+            );
+        """)
+
+    return dg.MaterializeResult(
+        data_version=dg.DataVersion(data_version),
+        metadata={**metadata, "skipped": False},
+    )
+
+
+def partition_files_lock(partition_file_path: str):
+    """
+    Exclusive lock on the monthly files of a table and their compacted
+    dataset. It is held while the files are replaced (split, compaction) and
+    while the loaders read them.
+    """
+    lock_path = f"{os.path.dirname(partition_file_path)}.lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    return _exclusive_file_lock(lock_path)
 
-@dg.asset(group_name="raw_files")
-def football_player_valuations_file():
-    """"""
-    df: pd.DataFrame = kagglehub.load_dataset(
-    KaggleDatasetAdapter.PANDAS,
-    "davidcariboo/player-scores",
-    "player_valuations.csv")
 
-    df["date"] = pd.to_datetime(df["date"], errors='coerce')
-    df["player_club_domestic_competition_id"] = df["player_club_domestic_competition_id"].astype(str)
-    df["market_value_in_eur"] = pd.to_numeric(df["market_value_in_eur"], errors='coerce').astype('Int64')
+def compacted_versions(compacted_path: str) -> dict:
+    """
+    The manifest of a compacted dataset: {year: directory} of the version
+    that currently holds each compacted year.
+    """
+    try:
+        with open(os.path.join(compacted_path, COMPACTED_MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
 
-    with open(constants.RAW_PLAYER_VALUATIONS_FILE_PATH, "wb") as f:
-        df.to_parquet(f, index=False)
+
+def _read_months_sql(months: list, partition_file_path: str, compacted_path: str) -> str:
+    """
+    Returns a relation with the rows of the given months. A month is read from
+    its own Parquet file while that exists, and from the current version of
+    its year in the compacted dataset once the year has been compacted.
+    """
+    versions = compacted_versions(compacted_path)
+    month_files = []
+    compacted_months = []
+    compacted_years = {}
+    for month in months:
+        month_file = partition_file_path.format(month)
+        year = str(int(month[:4]))
+        if not os.path.exists(month_file) and year in versions:
+            compacted_months.append(month.replace("-", ""))
+            compacted_years[year] = f"{compacted_path}/{versions[year]}/year={year}/*/*.parquet"
+        else:
+            month_files.append(month_file)
+
+    selects = []
+    if month_files:
+        selects.append(f"select * from read_parquet({month_files})")
+    if compacted_months:
+        # Filtering on the hive columns prunes the files of all other months.
+        selects.append(f"""
+            select * exclude (year, month)
+            from read_parquet({list(compacted_years.values())}, hive_partitioning = true)
+            where year * 100 + month in ({", ".join(compacted_months)})
+        """)
+    return "(" + " union all by name ".join(selects) + ")"
+
+
+def _create_indexes_sql(table_name: str) -> str:
+    return "\n".join(
+        f"create index if not exists {table_name}_{column}_idx on {table_name} ({column});"
+        for column in constants.INDEXED_COLUMNS[table_name]
+    )
+
+
+def _load_dimension_table(
+    database: DuckDBResource,
+    table_name: str,
+    parquet_path: str,
+) -> None:
+    """
+    Replaces a warehouse table with the contents of its parquet file, storing
+    the low-cardinality columns of the table as DuckDB ENUMs.
+    """
+    enum_columns = schemas.ENUM_COLUMNS[table_name]
+
+    enum_ddl = "".join(
+        f"""
+        drop type if exists {table_name}_{column};
+        create type {table_name}_{column} as enum (
+            select distinct {column} from '{parquet_path}'
+            where {column} is not null
+            order by {column}
+        );
+        """
+        for column in enum_columns
+    )
+    replace_clause = (
+        "replace ("
+        + ", ".join(f"{column}::{table_name}_{column} as {column}" for column in enum_columns)
+        + ")"
+        if enum_columns else ""
+    )
+
+    sql_query = f"""
+        begin transaction;
+
+        drop table if exists {table_name};
+        {enum_ddl}
+        create table {table_name} as 
+        select * {replace_clause} from '{parquet_path}';
+
+        commit;
+    """
+
+    with database.get_connection() as conn:
+        conn.execute(sql_query)
+
+
+def _split_monthly_partitions(
+    context: dg.AssetExecutionContext,
+    raw_file_path: str,
+    partition_file_path: str,
+) -> None:
+    """
+    Splits the raw parquet into one Parquet file per month of the requested
+    partition range. The raw file is scanned once, and the `date` filter is
+    pushed down so row groups outside of the range are never read.
+    """
+    time_window = context.partition_time_window
+    start_date = time_window.start.strftime(constants.DATE_FORMAT)
+    end_date = time_window.end.strftime(constants.DATE_FORMAT)
+
+    # Every run stages in its own directory, so concurrent partition runs
+    # never see (or delete) each other's output.
+    os.makedirs(os.path.dirname(partition_file_path), exist_ok=True)
+    staging_path = tempfile.mkdtemp(prefix="_staging_", dir=os.path.dirname(partition_file_path))
+    split_path = os.path.join(staging_path, "split")
+
+    try:
+        with instrumentation.connect() as conn:
+            conn.execute(f"""
+                copy (
+                    select *, strftime(date, '%Y-%m') as partition_month
+                    from read_parquet('{raw_file_path}')
+                    where date >= '{start_date}'
+                        and date < '{end_date}'
+                ) to '{split_path}' (format parquet, partition_by (partition_month));
+            """)
+
+            months = {}
+            for partition_key in context.partition_keys:
+                month_to_fetch = partition_key[:-3]
+                month_path = os.path.join(split_path, f"partition_month={month_to_fetch}")
+                target_path = partition_file_path.format(month_to_fetch)
+                month_files = sorted(os.listdir(month_path)) if os.path.isdir(month_path) else []
+
+                if len(month_files) == 1:
+                    months[target_path] = os.path.join(month_path, month_files[0])
+                    continue
+
+                # DuckDB may write several files per month when the input is
+                # not sorted by date; they are merged into one. Months without
+                # rows still get a file so the loaders can read it.
+                source = (
+                    f"read_parquet('{month_path}/*.parquet', hive_partitioning = false)" if month_files
+                    else f"(select * from read_parquet('{raw_file_path}') limit 0)"
+                )
+                merged_path = os.path.join(staging_path, f"{month_to_fetch}.parquet")
+                conn.execute(f"copy (select * from {source}) to '{merged_path}' (format parquet);")
+                months[target_path] = merged_path
+
+        # A running compaction or load finishes before the months change.
+        with partition_files_lock(partition_file_path):
+            for target_path, staged_path in months.items():
+                os.replace(staged_path, target_path)
+    finally:
+        shutil.rmtree(staging_path, ignore_errors=True)
+
+
+@dg.asset(group_name="raw_files")
+@instrumented
+def football_player_valuations_file(context: dg.AssetExecutionContext, storage: StorageResource) -> dg.MaterializeResult:
+    """
+    Downloads the player valuations dataset from Kaggle and saves it as a Parquet file.
+    Sorted by date so the row group statistics allow pushdown on `date`.
+    """
+    return _ingest_csv(
+        context,
+        "player_valuations.csv",
+        schemas.PLAYER_VALUATIONS_SCHEMA,
+        storage.path(constants.RAW_PLAYER_VALUATIONS_FILE_PATH),
+        order_by="date",
+    )
 
 @dg.asset(
     partitions_def=monthly_partition,
     deps=["football_player_valuations_file"],
-    group_name="partitioned_files"
+    group_name="partitioned_files",
+    backfill_policy=dg.BackfillPolicy.single_run(),
 )
-def monthly_player_valuations(context: dg.AssetExecutionContext) -> None:
+@instrumented
+def monthly_player_valuations(context: dg.AssetExecutionContext, storage: StorageResource) -> None:
     """
-    Loads the LOCAL raw parquet, filters it for the given month, 
-    and saves that partition as a Parquet file.
+    Loads the LOCAL raw parquet, filters it for the requested months, 
+    and saves each partition as a Parquet file.
     """
-    partition_date_str = context.partition_key
-    month_to_fetch = partition_date_str[:-3]
-    
-    start_date = pd.to_datetime(partition_date_str)
-    end_date = start_date + pd.offsets.MonthEnd(1)
-
-    df = pd.read_parquet(constants.RAW_PLAYER_VALUATIONS_FILE_PATH)
-
-    mask = (df['date'] >= start_date) & (df['date'] <= end_date)
-    df_partition = df[mask].copy()
-    
-    with open(constants.PLAYER_VALUATIONS_FILE_PATH.format(month_to_fetch), "wb") as f:
-        df_partition.to_parquet(f, index=False)
+    _split_monthly_partitions(
+        context,
+        storage.path(constants.RAW_PLAYER_VALUATIONS_FILE_PATH),
+        storage.path(constants.PLAYER_VALUATIONS_FILE_PATH),
+    )
 
 
 @dg.asset(
     partitions_def=monthly_partition,
     deps=["monthly_player_valuations"],
-    group_name="persisted"
+    group_name="persisted",
+    pool=constants.DUCKDB_WRITER_POOL,
+    backfill_policy=dg.BackfillPolicy.single_run(),
 )
+@instrumented
 def player_valuations_db(
     context: dg.AssetExecutionContext, 
     database: DuckDBResource,
+    storage: StorageResource,
 ) -> None:
     """
-    Scans all processed parquet files and loads them into a single
-    table in the DuckDB database.
-    """
-    monthly_partition = context.partition_key
-    month_to_fetch = monthly_partition[:-3]
-    sql_query = f"""
-        create table if not exists player_valuations (
-            player_id integer,
-            date date,
-            market_value float,
-            current_club_id integer,
-            competition_id varchar,
-            partition_date varchar
-        );
-
-        delete from player_valuations where partition_date = '{month_to_fetch}';
-
-        insert into player_valuations 
-        select
-            player_id,
-            date,
-            market_value_in_eur,
-            current_club_id,
-            player_club_domestic_competition_id,
-            '{month_to_fetch}' as partition_date
-          from '{constants.PLAYER_VALUATIONS_FILE_PATH.format(month_to_fetch)}';
+    Loads the requested months from their parquet files or the compacted
+    dataset into a single table in the DuckDB database, replacing those
+    months in one transaction. The players whose rows were replaced are
+    recorded in `player_valuation_changes`.
     """
+    months_to_fetch = [partition_key[:-3] for partition_key in context.partition_keys]
+    # The month files and the compacted dataset stay in place until the
+    # months are loaded.
+    with partition_files_lock(storage.path(constants.PLAYER_VALUATIONS_FILE_PATH)):
+        months_source = _read_months_sql(
+            months_to_fetch,
+            storage.path(constants.PLAYER_VALUATIONS_FILE_PATH),
+            storage.path(constants.COMPACTED_PLAYER_VALUATIONS_PATH),
+        )
+        sql_query = f"""
+            create table if not exists player_valuations (
+                player_id integer,
+                date date,
+                market_value float,
+                current_club_id integer,
+                competition_id varchar,
+                partition_date varchar
+            );
+            {_create_indexes_sql("player_valuations")}
+            {PLAYER_VALUATION_CHANGES_DDL}
+
+            begin transaction;
+
+            -- The players of the replaced rows, for player_valuation_summary_db.
+            insert into player_valuation_changes
+            select distinct player_id
+            from player_valuations
+            where partition_date between '{months_to_fetch[0]}' and '{months_to_fetch[-1]}';
+
+            delete from player_valuations
+            where partition_date between '{months_to_fetch[0]}' and '{months_to_fetch[-1]}';
+
+            insert into player_valuations 
+            select
+                player_id,
+                date,
+                market_value_in_eur,
+                current_club_id,
+                player_club_domestic_competition_id,
+                strftime(date, '%Y-%m') as partition_date
+              from {months_source}
+              order by {constants.CLUSTER_KEYS["player_valuations"]};
+
+            commit;
+        """
     
-    # Use the resource to run the query
-    with database.get_connection() as conn:
-        conn.execute(sql_query)
+        with database.get_connection() as conn:
+            conn.execute(sql_query)
 
 
 @dg.asset(group_name="raw_files")
-def football_competitions_file():
-    """"""
-    df: pd.DataFrame = kagglehub.load_dataset(
-    KaggleDatasetAdapter.PANDAS,
-    "davidcariboo/player-scores",
-    "competitions.csv",
+@instrumented
+def football_competitions_file(context: dg.AssetExecutionContext, storage: StorageResource) -> dg.MaterializeResult:
+    """
+    Downloads the competitions dataset from Kaggle and saves it as a Parquet file.
+    """
+    return _ingest_csv(
+        context,
+        "competitions.csv",
+        schemas.COMPETITIONS_SCHEMA,
+        storage.path(constants.COMPETITIONS_FILE_PATH),
     )
-    df["date"] = pd.to_datetime(df["date"], errors='coerce')
-    
-    object_cols = df.select_dtypes(['object']).columns
-    if len(object_cols) > 0:
-        for col in object_cols:
-            df[col] = df[col].astype(str)
-
-    with open(constants.COMPETITIONS_FILE_PATH, "wb") as f:
-        df.to_parquet(f, index=False)
 
 
 @dg.asset(deps=["football_competitions_file"],
-          group_name="persisted")
-def football_competitions_db(database: DuckDBResource) -> None:
-    """
-    Loads the competitions parquet file into a DuckDB table.
+          group_name="persisted",
+          pool=constants.DUCKDB_WRITER_POOL)
+@instrumented
+def football_competitions_db(
+    context: dg.AssetExecutionContext,
+    database: DuckDBResource,
+    storage: StorageResource,
+) -> None:
     """
-    sql_query = f"""
-        create table if not exists competitions as 
-        select * from '{constants.COMPETITIONS_FILE_PATH}';
+    Loads the competitions parquet file into a DuckDB table and adds a
+    competition partition for every domestic league that is new.
     """
-    
-    # Use the resource to run the query
+    _load_dimension_table(database, "competitions", storage.path(constants.COMPETITIONS_FILE_PATH))
+
     with database.get_connection() as conn:
-        conn.execute(sql_query)
+        competition_ids = [
+            row[0] for row in conn.execute("""
+                select competition_id from competitions
+                where type = 'domestic_league'
+                order by competition_id
+            """).fetchall()
+        ]
+
+    partitions_name = domestic_competition_partition.name
+    known_ids = set(context.instance.get_dynamic_partitions(partitions_name))
+    new_ids = [competition_id for competition_id in competition_ids if competition_id not in known_ids]
+    if new_ids:
+        context.instance.add_dynamic_partitions(partitions_name, new_ids)
+        context.log.info(f"Added competition partitions: {', '.join(new_ids)}")
 
 
 @dg.asset(group_name="raw_files")
-def football_players_file():
-    """"""
-    df: pd.DataFrame = kagglehub.load_dataset(
-    KaggleDatasetAdapter.PANDAS,
-    "davidcariboo/player-scores",
-    "players.csv",
+@instrumented
+def football_players_file(context: dg.AssetExecutionContext, storage: StorageResource) -> dg.MaterializeResult:
+    """
+    Downloads the players dataset from Kaggle and saves it as a Parquet file.
+    """
+    return _ingest_csv(
+        context,
+        "players.csv",
+        schemas.PLAYERS_SCHEMA,
+        storage.path(constants.PLAYERS_FILE_PATH),
     )
 
-    with open(constants.PLAYERS_FILE_PATH, "wb") as f:
-        df.to_parquet(f, index=False)
-
 
 @dg.asset(
         deps=["football_players_file"],
-    group_name="persisted"
+    group_name="persisted",
+    pool=constants.DUCKDB_WRITER_POOL
 )
+@instrumented
 def football_players_db(
     database: DuckDBResource,
+    storage: StorageResource,
 ) -> None:
     """
     Loads the players parquet file into a DuckDB table.
     """
-    sql_query = f"""
-        create table if not exists players as 
-        select * from '{constants.PLAYERS_FILE_PATH}';
-    """
-    
-    # Use the resource to run the query
-    with database.get_connection() as conn:
-        conn.execute(sql_query)
+    _load_dimension_table(database, "players", storage.path(constants.PLAYERS_FILE_PATH))
 
 
 @dg.asset(group_name="raw_files")
-def football_player_appearances_file():
+@instrumented
+def football_player_appearances_file(context: dg.AssetExecutionContext, storage: StorageResource) -> dg.MaterializeResult:
     """
     Downloads the player appearances dataset from Kaggle and saves it as a Parquet file.
+    Sorted by date so the row group statistics allow pushdown on `date`.
     """
-    df: pd.DataFrame = kagglehub.load_dataset(
-    KaggleDatasetAdapter.PANDAS,
-    "davidcariboo/player-scores",
-    "appearances.csv"
+    return _ingest_csv(
+        context,
+        "appearances.csv",
+        schemas.PLAYER_APPEARANCES_SCHEMA,
+        storage.path(constants.RAW_PLAYER_APPEARANCES_FILE_PATH),
+        order_by="date",
     )
 
-    df["date"] = pd.to_datetime(df["date"], errors='coerce')
-    
-    object_cols = df.select_dtypes(['object']).columns
-    if len(object_cols) > 0:
-        for col in object_cols:
-            df[col] = df[col].astype(str)
-
-    with open(constants.RAW_PLAYER_APPEARANCES_FILE_PATH, "wb") as f:
-        df.to_parquet(f, index=False)
-
 
 @dg.asset(
     partitions_def=monthly_partition,
     deps=["football_player_appearances_file"],
-    group_name="partitioned_files"
+    group_name="partitioned_files",
+    backfill_policy=dg.BackfillPolicy.single_run(),
 )
-def monthly_player_appearances(context: dg.AssetExecutionContext) -> None:
+@instrumented
+def monthly_player_appearances(context: dg.AssetExecutionContext, storage: StorageResource) -> None:
     """
-    Loads the LOCAL raw parquet, filters it for the given month, 
-    and saves that partition as a Parquet file.
+    Loads the LOCAL raw parquet, filters it for the requested months, 
+    and saves each partition as a Parquet file.
     """
-    partition_date_str = context.partition_key
-    month_to_fetch = partition_date_str[:-3]
-
-    start_date = pd.to_datetime(partition_date_str)
-    end_date = start_date + pd.offsets.MonthEnd(1)
-
-    df = pd.read_parquet(constants.RAW_PLAYER_APPEARANCES_FILE_PATH)
-    
-    mask = (df['date'] >= start_date) & (df['date'] <= end_date)
-    df_partition = df[mask].copy()
-    
-    with open(constants.PLAYER_APPEARANCES_FILE_PATH.format(month_to_fetch), "wb") as f:
-        df_partition.to_parquet(f, index=False)
+    _split_monthly_partitions(
+        context,
+        storage.path(constants.RAW_PLAYER_APPEARANCES_FILE_PATH),
+        storage.path(constants.PLAYER_APPEARANCES_FILE_PATH),
+    )
 
 
 @dg.asset(
     partitions_def=monthly_partition,
     deps=["monthly_player_appearances"],
-    group_name="persisted"
+    group_name="persisted",
+    pool=constants.DUCKDB_WRITER_POOL,
+    backfill_policy=dg.BackfillPolicy.single_run(),
 )
+@instrumented
 def player_appearances_db(
     context: dg.AssetExecutionContext, 
     database: DuckDBResource,
+    storage: StorageResource,
 ) -> None:
-    
-    monthly_partition = context.partition_key
-    month_to_fetch = monthly_partition[:-3]
-    sql_query = f"""
-        create table if not exists player_appearances (
-            appearance_id varchar,
-            game_id integer,
-            player_id integer,
-            player_club_id integer,
-            player_current_club_id integer,
-            date date,
-            player_name varchar,
-            competition_id varchar,
-            yellow_cards integer,
-            red_cards integer,
-            goals integer,
-            assists integer,
-            minutes_played integer,
-            partition_date varchar
-        );
-
-        delete from player_appearances where partition_date = '{month_to_fetch}';
-
-        insert into player_appearances 
-        select
-            appearance_id,
-            game_id,
-            player_id,
-            player_club_id,
-            player_current_club_id,
-            date,
-            player_name,
-            competition_id,
-            yellow_cards,
-            red_cards,
-            goals,
-            assists,
-            minutes_played,
-            '{month_to_fetch}' as partition_date
-          from '{constants.PLAYER_APPEARANCES_FILE_PATH.format(month_to_fetch)}';
     """
-
-    with database.get_connection() as conn:
-        conn.execute(sql_query)
+    Loads the requested months from their parquet files or the compacted
+    dataset into a single table in the DuckDB database, replacing those
+    months in one transaction.
+    """
+    months_to_fetch = [partition_key[:-3] for partition_key in context.partition_keys]
+    # The month files and the compacted dataset stay in place until the
+    # months are loaded.
+    with partition_files_lock(storage.path(constants.PLAYER_APPEARANCES_FILE_PATH)):
+        months_source = _read_months_sql(
+            months_to_fetch,
+            storage.path(constants.PLAYER_APPEARANCES_FILE_PATH),
+            storage.path(constants.COMPACTED_PLAYER_APPEARANCES_PATH),
+        )
+        sql_query = f"""
+            create table if not exists player_appearances (
+                appearance_id varchar,
+                game_id integer,
+                player_id integer,
+                player_club_id integer,
+                player_current_club_id integer,
+                date date,
+                player_name varchar,
+                competition_id varchar,
+                yellow_cards tinyint,
+                red_cards tinyint,
+                goals tinyint,
+                assists tinyint,
+                minutes_played smallint,
+                partition_date varchar
+            );
+            {_create_indexes_sql("player_appearances")}
+
+            begin transaction;
+
+            delete from player_appearances
+            where partition_date between '{months_to_fetch[0]}' and '{months_to_fetch[-1]}';
+
+            insert into player_appearances 
+            select
+                appearance_id,
+                game_id,
+                player_id,
+                player_club_id,
+                player_current_club_id,
+                date,
+                player_name,
+                competition_id,
+                yellow_cards,
+                red_cards,
+                goals,
+                assists,
+                minutes_played,
+                strftime(date, '%Y-%m') as partition_date
+              from {months_source}
+              order by {constants.CLUSTER_KEYS["player_appearances"]};
+
+            commit;
+        """
+
+        with database.get_connection() as conn:
+            conn.execute(sql_query)
 
 
 @dg.asset(group_name="raw_files")
-def football_clubs_file():
-    """"""
-    df: pd.DataFrame = kagglehub.load_dataset(
-    KaggleDatasetAdapter.PANDAS,
-    "davidcariboo/player-scores",
-    "clubs.csv",
+@instrumented
+def football_clubs_file(context: dg.AssetExecutionContext, storage: StorageResource) -> dg.MaterializeResult:
+    """
+    Downloads the clubs dataset from Kaggle and saves it as a Parquet file.
+    """
+    return _ingest_csv(
+        context,
+        "clubs.csv",
+        schemas.CLUBS_SCHEMA,
+        storage.path(constants.CLUBS_FILE_PATH),
     )
 
-    df["total_market_value"] = pd.to_numeric(df["total_market_value"], errors='coerce').astype('Int64')
-    df["average_age"] = pd.to_numeric(df["average_age"], errors='coerce').astype('Float64')
-    df["foreigners_percentage"] = pd.to_numeric(df["foreigners_percentage"], errors='coerce').astype('Float64')
-    
-
-    object_cols = df.select_dtypes(['object']).columns
-    if len(object_cols) > 0:
-        for col in object_cols:
-            df[col] = df[col].astype(str)
-
-    with open(constants.CLUBS_FILE_PATH, "wb") as f:
-        df.to_parquet(f, index=False)
-
 
 @dg.asset(deps=["football_clubs_file"],
-    group_name="persisted")
-def football_clubs_db(database: DuckDBResource) -> None:
+    group_name="persisted",
+    pool=constants.DUCKDB_WRITER_POOL)
+@instrumented
+def football_clubs_db(database: DuckDBResource, storage: StorageResource) -> None:
     """
     Loads the clubs parquet file into a DuckDB table.
     """
-    sql_query = f"""
-        create table if not exists clubs as 
-        select * from '{constants.CLUBS_FILE_PATH}';
-    """
-    
-    # Use the resource to run the query
-    with database.get_connection() as conn:
-        conn.execute(sql_query)
+    _load_dimension_table(database, "clubs", storage.path(constants.CLUBS_FILE_PATH))
 
 
 @dg.asset(
         deps=["football_competitions_db"],
         group_name="static_files"
 )
+@instrumented
 def league_logos(
     database: DuckDBResource,
-):
+    storage: StorageResource,
+) -> dg.MaterializeResult:
+    """
+    Scrapes the logo of every competition from its website. Pages are fetched
+    concurrently through a persistent HTTP cache, so refreshes only issue
+    conditional requests; competitions that fail are reported in the metadata.
+    """
+    from utils.http_cache import HttpCache
+    from utils.logos import fetch_logos
 
     query = """
     select distinct competition_id, url
@@ -316,85 +622,61 @@ def league_logos(
     """
     
     with database.get_connection() as conn:
-        df = conn.execute(query).fetchdf()
+        competitions = conn.execute(query).fetchall()
 
-    for _, row in df.iterrows():
-        competition_id = row['competition_id']
-        url = row['url']
-        image_path = constants.LEAGUE_LOGOS_PATH.format(competition_id)
-        if os.path.exists(image_path):
-            continue  # Logo already exists, skip downloading
+    cache = HttpCache(
+        storage.path(constants.HTTP_CACHE_PATH),
+        ttl=constants.HTTP_CACHE_TTL,
+        max_bytes=constants.HTTP_CACHE_MAX_BYTES,
+    )
+    logos_path = storage.path(constants.LEAGUE_LOGOS_PATH)
+    os.makedirs(os.path.dirname(logos_path), exist_ok=True)
+    result = fetch_logos(
+        competitions,
+        logos_path,
+        max_workers=constants.LOGO_MAX_WORKERS,
+        timeout=constants.LOGO_REQUEST_TIMEOUT,
+        cache=cache,
+    )
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    return dg.MaterializeResult(
+        metadata={
+            "fetched": len(result["fetched"]),
+            "unchanged": len(result["unchanged"]),
+            "cache_hits": cache.stats["hits"],
+            "cache_revalidated": cache.stats["revalidated"],
+            "cache_misses": cache.stats["misses"],
+            "failed": len(result["failures"]),
+            "failures": dg.MetadataValue.json(result["failures"]),
         }
-
-        try:
-            page_response = requests.get(url, headers=headers)
-            page_response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"Fehler beim Abrufen der Seite für Wettbewerb {competition_id} von {url}: {e}")
-            raise
-
-        soup = BeautifulSoup(page_response.text, "html.parser")
-        logo_container = soup.find("div", class_="data-header__profile-container")
-
-        if not logo_container:
-            raise Exception("Konnte den Logo-Container (div.data-header__profile-container) nicht finden. Die Seitenstruktur hat sich möglicherweise geändert.")
-
-        # 4. Finde das <img>-Tag *innerhalb* dieses Containers
-        logo_img_tag = logo_container.find("img")
-
-        if not logo_img_tag:
-            raise Exception("Logo-Container gefunden, aber kein <img>-Tag darin.")
-
-        # 5. Die 'src'-URL aus dem Tag extrahieren
-        image_url = logo_img_tag.get("src")
-        
-        if not image_url:
-            raise Exception("<img>-Tag gefunden, aber es hat kein 'src'-Attribut.")
-
-        # 6. Das eigentliche Bild herunterladen
-        try:
-            image_response = requests.get(str(image_url), headers=headers)
-            
-            image_response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            raise
-
-        # 7. Das Bild lokal speichern
-        with open(image_path, "wb") as img_file:
-            img_file.write(image_response.content)
+    )
 
 
 @dg.asset(group_name="raw_files")
-def football_games_file():
-    """dd"""
-    df: pd.DataFrame = kagglehub.load_dataset(
-    KaggleDatasetAdapter.PANDAS,
-    "davidcariboo/player-scores",
-    "games.csv",
+@instrumented
+def football_games_file(context: dg.AssetExecutionContext, storage: StorageResource) -> dg.MaterializeResult:
+    """
+    Downloads the games dataset from Kaggle and saves it as a Parquet file.
+    """
+    return _ingest_csv(
+        context,
+        "games.csv",
+        schemas.GAMES_SCHEMA,
+        storage.path(constants.GAMES_FILE_PATH),
     )
 
-    with open(constants.GAMES_FILE_PATH, "wb") as f:
-        df.to_parquet(f, index=False)
-
 
 @dg.asset(
     deps=["football_games_file"],
-    group_name="persisted"
+    group_name="persisted",
+    pool=constants.DUCKDB_WRITER_POOL
 )
+@instrumented
 def football_games_db(
-    database: DuckDBResource
+    database: DuckDBResource,
+    storage: StorageResource,
 ) -> None:
     """
     Loads the games parquet file into a DuckDB table.
     """
-    sql_query = f"""
-        create table if not exists games as 
-        select * from '{constants.GAMES_FILE_PATH}';
-    """
-    
-    # Use the resource to run the query
-    with database.get_connection() as conn:
-        conn.execute(sql_query)
\ No newline at end of file
+    _load_dimension_table(database, "games", storage.path(constants.GAMES_FILE_PATH))
\ No newline at end of file
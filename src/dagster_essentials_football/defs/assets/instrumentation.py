@@ -0,0 +1,212 @@
+import contextvars
+import functools
+import json
+import os
+import time
+import typing
+from contextlib import contextmanager
+
+import dagster as dg
+import duckdb
+
+from dagster_essentials_football.defs.assets import constants
+
+# Statements whose "Count" result is the number of rows they wrote.
+WRITE_STATEMENT_TYPES = {
+    duckdb.StatementType.INSERT,
+    duckdb.StatementType.COPY,
+    duckdb.StatementType.CREATE,
+}
+STATEMENT_PREVIEW_LENGTH = 120
+
+_current_recorder = contextvars.ContextVar("duckdb_query_recorder", default=None)
+
+
+def _written_bytes() -> int:
+    """
+    Returns the bytes this process passed to write calls so far, or -1 where
+    /proc is not available.
+    """
+    try:
+        with open("/proc/self/io") as io_counters:
+            for line in io_counters:
+                if line.startswith("wchar:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return -1
+
+
+class QueryRecorder:
+    """
+    Collects the timings and row counts of the DuckDB statements an asset runs.
+    """
+
+    def __init__(self, keep_profiles: bool):
+        self.keep_profiles = keep_profiles
+        self.queries = []
+        self.profiles = []
+
+    def record(self, statement: str, seconds: float, profile: dict, rows_written: int) -> None:
+        self.queries.append({
+            "statement": " ".join(statement.split())[:STATEMENT_PREVIEW_LENGTH],
+            "seconds": round(max(seconds, profile.get("latency", 0.0)), 4),
+            "rows_scanned": profile.get("cumulative_rows_scanned", 0),
+            "rows_written": rows_written,
+        })
+        if self.keep_profiles:
+            self.profiles.append(profile)
+
+    def metadata(self) -> dict:
+        metadata = {
+            "rows_read": sum(query["rows_scanned"] for query in self.queries),
+            "rows_written": sum(query["rows_written"] for query in self.queries),
+            "duckdb_query_seconds": round(sum(query["seconds"] for query in self.queries), 4),
+            "duckdb_queries": dg.MetadataValue.json(self.queries),
+        }
+        if self.keep_profiles:
+            metadata["duckdb_profiles"] = dg.MetadataValue.json(self.profiles)
+        return metadata
+
+
+class InstrumentedConnection:
+    """
+    Wraps a DuckDB connection and runs every statement of an `execute` call on
+    its own, so each one is timed and profiled separately. Everything other
+    than `execute` is passed through to the wrapped connection.
+    """
+
+    def __init__(self, conn, recorder: QueryRecorder):
+        self._conn = conn
+        self._recorder = recorder
+        self._pending = None
+        conn.execute("set enable_profiling = 'no_output'")
+
+    def execute(self, query, parameters=None):
+        self._record_pending()
+
+        if parameters is not None:
+            statements = [(query, None)]
+        else:
+            statements = [(statement.query, statement.type) for statement in duckdb.extract_statements(query)]
+
+        for index, (statement, statement_type) in enumerate(statements):
+            start = time.perf_counter()
+            if parameters is not None:
+                self._conn.execute(statement, parameters)
+            else:
+                self._conn.execute(statement)
+            seconds = time.perf_counter() - start
+
+            rows_written = 0
+            if statement_type in WRITE_STATEMENT_TYPES and self._conn.description:
+                if self._conn.description[0][0] == "Count":
+                    count = self._conn.fetchone()
+                    rows_written = count[0] if count else 0
+
+            self._pending = (statement, seconds, rows_written)
+            # The profile of the last statement is only complete once its
+            # result has been fetched by the caller.
+            if index < len(statements) - 1:
+                self._record_pending()
+
+        return self
+
+    def _record_pending(self) -> None:
+        if self._pending is None:
+            return
+        statement, seconds, rows_written = self._pending
+        self._pending = None
+        try:
+            profile = json.loads(self._conn.get_profiling_information(format="json"))
+        except (duckdb.Error, ValueError):
+            profile = {}
+        self._recorder.record(statement, seconds, profile, rows_written)
+
+    def close(self) -> None:
+        self._record_pending()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+@contextmanager
+def instrument_connection(conn):
+    """
+    Yields `conn` wrapped in an InstrumentedConnection while an instrumented
+    asset is running, and `conn` itself otherwise.
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield conn
+        return
+
+    instrumented = InstrumentedConnection(conn, recorder)
+    try:
+        yield instrumented
+    finally:
+        instrumented._record_pending()
+
+
+def connect(*args, **kwargs):
+    """
+    `duckdb.connect` for the in-memory connections assets open themselves.
+    """
+    conn = duckdb.connect(*args, **kwargs)
+    recorder = _current_recorder.get()
+    return conn if recorder is None else InstrumentedConnection(conn, recorder)
+
+
+def instrumented(fn):
+    """
+    Records the wall time, peak memory, bytes written and DuckDB query
+    statistics of an asset as materialization metadata. Set
+    FOOTBALL_DUCKDB_PROFILE=1 to also attach DuckDB's profile of every
+    statement.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        from utils.memory import peak_rss_bytes, reset_peak_rss
+
+        recorder = QueryRecorder(keep_profiles=os.environ.get(constants.DUCKDB_PROFILE_ENV) == "1")
+        token = _current_recorder.set(recorder)
+        reset_peak_rss()
+        written_bytes_before = _written_bytes()
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        finally:
+            _current_recorder.reset(token)
+
+        metadata = {
+            "wall_time_seconds": round(time.perf_counter() - start, 4),
+            "peak_rss_mb": round(peak_rss_bytes() / 1024 / 1024, 1),
+            **recorder.metadata(),
+        }
+        if written_bytes_before >= 0:
+            metadata["bytes_written"] = _written_bytes() - written_bytes_before
+
+        if result is None:
+            return dg.MaterializeResult(metadata=metadata)
+        if isinstance(result, dg.MaterializeResult):
+            return result._replace(metadata={**(result.metadata or {}), **metadata})
+        if isinstance(result, dg.Output):
+            return result.with_metadata({**result.metadata, **metadata})
+        # A value for the asset's IO manager.
+        return dg.Output(result, metadata=metadata)
+
+    return_type = fn.__annotations__.get("return")
+    if return_type not in (None, dg.MaterializeResult) and typing.get_origin(return_type) is not dg.Output:
+        # Dagster only accepts the Output carrying the metadata when the
+        # asset is annotated to return one.
+        wrapper.__annotations__ = {**fn.__annotations__, "return": dg.Output[return_type]}
+
+    return wrapper
@@ -1,72 +1,75 @@
-import base64
+import os
+from datetime import timedelta
 import dagster as dg
 from dagster_duckdb import DuckDBResource
-import matplotlib
-
-from utils.plot import plot_leagues
-matplotlib.use("Agg")
-
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
-import matplotlib.image as mpimg
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
-from dagster_essentials_football.defs.partitions import monthly_partition
-import pandas as pd
+from dagster_essentials_football.defs.partitions import (
+    COMPETITION_SLICE_CLUBS,
+    COMPETITION_SLICE_FILTER,
+    competition_month_slices,
+    monthly_competition_partition,
+    monthly_partition,
+)
+from dagster_essentials_football.defs.resources import SerializedDuckDBResource
+from dagster_essentials_football.defs.storage import StorageResource
 from dagster_essentials_football.defs.assets import constants
-import seaborn as sns
+from dagster_essentials_football.defs.assets.instrumentation import instrumented
 
 
     
 
+def _league_valuation_select(
+    start_date: str,
+    end_date: str,
+    clubs: str = "clubs",
+    slice_filter: str = "",
+) -> str:
+    """
+    Returns the select aggregating the valuations between `start_date` and
+    `end_date` per domestic competition and month. The competition partitions
+    pass the clubs of their competitions and a `slice_filter` join keeping
+    only their (month, competition) slices.
+    """
+    return f"""
+        select
+            c.domestic_competition_id,
+            sum(v.market_value) as total_valuation,
+            min(v.market_value) as min_valuation,
+            max(v.market_value) as max_valuation,
+            count(v.market_value) as player_count,
+            strftime(date_trunc('month', v.date), '%Y-%m-%d') as partition_date
+        from
+            player_valuations as v
+        join {clubs} as c
+            on v.current_club_id = c.club_id
+        {slice_filter}
+        where v.date >= '{start_date}'
+            and v.date < '{end_date}'
+        group by
+            c.domestic_competition_id,
+            date_trunc('month', v.date)
+    """
+
+
 @dg.asset(
         partitions_def=monthly_partition,
         deps=["football_competitions_db",
               "football_clubs_db",
               "player_valuations_db"],
-        group_name="persisted"
+        group_name="persisted",
+        pool=constants.DUCKDB_WRITER_POOL,
+        backfill_policy=dg.BackfillPolicy.single_run(),
 )
+@instrumented
 def league_valuation_evolution_db(
     context: dg.AssetExecutionContext,
     database: DuckDBResource,
-):
+) -> None:
     """
     calculates and stores league valuation evolution of leagues in the database.
     """
-    monthly_partition = context.partition_key
+    partition_keys = context.partition_keys
+    time_window = context.partition_time_window
     query = f"""
-        select
-            c.domestic_competition_id,
-            v.market_value
-        from
-            player_valuations as v
-        join clubs as c
-            on v.current_club_id = c.club_id
-        where v.date >= '{monthly_partition}'
-            and v.date < '{monthly_partition}'::date + interval '1 month'
-        """
-    
-    with database.get_connection() as conn:
-        result = conn.execute(query).fetch_df()
-
-    if result.empty:
-        return
-    
-    object_cols = result.select_dtypes(['object']).columns
-    if len(object_cols) > 0:
-        for col in object_cols:
-            result[col] = result[col].astype(str)
-    
-
-    monthly_league_valuations = result.groupby('domestic_competition_id').agg(
-        total_valuation=('market_value', 'sum'),
-        min_valuation=('market_value', 'min'),
-        max_valuation=('market_value', 'max'),
-        player_count=('market_value', 'count')
-    ).reset_index()
-    
-    monthly_league_valuations['partition_date'] = monthly_partition
-
-    ddl_query = f"""
         create table if not exists league_valuation_evolution (
             domestic_competition_id varchar,
             total_valuation float,
@@ -76,167 +79,284 @@ def league_valuation_evolution_db(
             partition_date varchar
         );
 
-        delete from league_valuation_evolution where partition_date = '{monthly_partition}';
+        begin transaction;
+
+        delete from league_valuation_evolution
+        where partition_date between '{partition_keys[0]}' and '{partition_keys[-1]}';
+
+        insert into league_valuation_evolution (
+            domestic_competition_id,
+            total_valuation,
+            min_valuation,
+            max_valuation,
+            player_count,
+            partition_date
+        )
+        {_league_valuation_select(
+            time_window.start.strftime(constants.DATE_FORMAT),
+            time_window.end.strftime(constants.DATE_FORMAT),
+        )};
+
+        commit;
     """
 
     with database.get_connection() as conn:
-        conn.execute(ddl_query)
-        conn.register('temp_data_view', monthly_league_valuations)
-
-        insert_query = """
-            insert into league_valuation_evolution (
-                domestic_competition_id,
-                total_valuation,
-                min_valuation,
-                max_valuation,
-                player_count,
-                partition_date
-            )
-            select 
-                domestic_competition_id,
-                total_valuation,
-                min_valuation,
-                max_valuation,
-                player_count,
-                partition_date
-            from temp_data_view;
-        """
-
-        conn.execute(insert_query)
-        conn.unregister('temp_data_view')
+        conn.execute(query)
 
 
 @dg.asset(
-        deps=["league_valuation_evolution_db",
-              "league_logos"],
-        group_name="reports"
+        partitions_def=monthly_partition,
+        deps=["league_valuation_evolution_db"],
+        group_name="persisted",
+        pool=constants.DUCKDB_WRITER_POOL,
+        backfill_policy=dg.BackfillPolicy.single_run(),
 )
-def first_league_valuation(
+@instrumented
+def league_valuation_yearly_db(
+    context: dg.AssetExecutionContext,
     database: DuckDBResource,
-):
+) -> None:
     """
-    creates a graph showing the evolution of first leagues valuations evolution over time.
+    maintains the yearly rollup of the league valuation evolution. Only the
+    years touched by the requested months are recomputed.
     """
-    query = """
+    time_window = context.partition_time_window
+    first_year = time_window.start.year
+    last_year = (time_window.end - timedelta(days=1)).year
+
+    query = f"""
+        create table if not exists league_valuation_yearly (
+            domestic_competition_id varchar,
+            year integer,
+            total_valuation float,
+            max_valuation float,
+            month_count integer
+        );
+
+        begin transaction;
+
+        delete from league_valuation_yearly
+        where year between {first_year} and {last_year};
+
+        insert into league_valuation_yearly (
+            domestic_competition_id,
+            year,
+            total_valuation,
+            max_valuation,
+            month_count
+        )
         select
-            lve.domestic_competition_id,
-            lve.total_valuation,
-            lve.max_valuation,
-            lve.partition_date,
-            fc.name as competition_name,
-            fc.country_name
+            domestic_competition_id,
+            year(partition_date::date) as year,
+            max(total_valuation) as total_valuation,
+            max(max_valuation) as max_valuation,
+            count(*) as month_count
         from
-            league_valuation_evolution as lve
-        join competitions as fc
-            on lve.domestic_competition_id = fc.competition_id
-        where fc.sub_type = 'first_tier'
-        order by
-            lve.partition_date asc;
+            league_valuation_evolution
+        where partition_date >= '{first_year}-01-01'
+            and partition_date < '{last_year + 1}-01-01'
+        group by
+            domestic_competition_id,
+            year(partition_date::date);
+
+        commit;
     """
 
     with database.get_connection() as conn:
-        result = conn.execute(query).fetch_df()
+        conn.execute(query)
 
-    if result.empty:
-        return
-    
-    result['partition_date'] = pd.to_datetime(result['partition_date'])
 
-    result = result[result['partition_date'] < pd.to_datetime("2025-01-01")]
+@dg.asset(
+        partitions_def=monthly_competition_partition,
+        deps=["football_competitions_db",
+              "football_clubs_db",
+              "player_valuations_db"],
+        group_name="persisted",
+        pool=constants.DUCKDB_WRITER_POOL,
+)
+@instrumented
+def league_competition_valuation_db(
+    context: dg.AssetExecutionContext,
+    database: DuckDBResource,
+) -> None:
+    """
+    calculates the league valuation evolution per month and domestic competition,
+    so a correction for one league only recomputes that league's partitions.
+    """
+    values, start_date, end_date = competition_month_slices(context.partition_keys)
+    query = f"""
+        create table if not exists league_competition_valuation_evolution (
+            domestic_competition_id varchar,
+            total_valuation float,
+            min_valuation float,
+            max_valuation float,
+            player_count integer,
+            partition_date varchar
+        );
 
-    all_league_ids = result['domestic_competition_id'].unique()
-    total_leagues_count = len(all_league_ids)
+        create or replace temp table partition_slices as
+        select * from (values {values}) as s(partition_date, domestic_competition_id);
+
+        begin transaction;
+
+        delete from league_competition_valuation_evolution as l
+        using partition_slices as s
+        where l.partition_date = s.partition_date
+            and l.domestic_competition_id = s.domestic_competition_id;
+
+        insert into league_competition_valuation_evolution (
+            domestic_competition_id,
+            total_valuation,
+            min_valuation,
+            max_valuation,
+            player_count,
+            partition_date
+        )
+        {_league_valuation_select(
+            start_date,
+            end_date,
+            clubs=COMPETITION_SLICE_CLUBS,
+            slice_filter=COMPETITION_SLICE_FILTER,
+        )};
+
+        commit;
+    """
 
-    N = 5
-    latest_year = result['partition_date'].dt.year.max()
-    data_last_year = result[result['partition_date'].dt.year == latest_year]
-    top_n_vals = data_last_year.groupby('domestic_competition_id')['total_valuation'].max()
-    top_n_ids = top_n_vals.sort_values(ascending=False).head(N).index
+    with database.get_connection() as conn:
+        conn.execute(query)
 
-    N = 7
-    top_n_vals = data_last_year.groupby('domestic_competition_id')['max_valuation'].max()
-    top_n_ids_max = top_n_vals.sort_values(ascending=False).head(N).index
-    
-    result['year'] = result['partition_date'].dt.year
-    yearly_data = result.groupby(['domestic_competition_id', 'year']).agg(
-        total_valuation=('total_valuation', 'max'),
-        competition_name=('competition_name', 'first'),
-        country_name=('country_name', 'first'),
-        max_valuation=('max_valuation', 'max'),
-    ).reset_index()
 
+def _top_leagues_with_other(yearly_data, statistic: str, n: int):
+    """
+    Keeps the `n` leagues with the highest `statistic` in the latest year and
+    folds all other leagues into one "Other" line per year.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
 
-    yearly_data["competition_name"] = yearly_data["competition_name"].map(
-        lambda x: " ".join(x.capitalize() for x in x.split("-"))
-    )
+    total_leagues_count = len(pc.unique(yearly_data['domestic_competition_id']))
 
-    
-    yearly_data_total = yearly_data[yearly_data['domestic_competition_id'].isin(top_n_ids)]
-    other_total = yearly_data[~yearly_data['domestic_competition_id'].isin(top_n_ids)].groupby('year').agg(
-        total_valuation=('total_valuation', 'max'),
-    ).reset_index()
+    latest_year = pc.max(yearly_data['year'])
+    data_last_year = yearly_data.filter(pc.equal(yearly_data['year'], latest_year))
+    top_n_ids = data_last_year.sort_by([(statistic, 'descending')])['domestic_competition_id'][:n]
 
-    other_leagues_count = total_leagues_count - len(top_n_ids)
-    other_total['domestic_competition_id'] = 'Other'
-    other_total['competition_name'] = 'Other'
-    other_total['country_name'] = str(other_leagues_count)
-    yearly_data_total = pd.concat([yearly_data_total, other_total], ignore_index=True)
+    is_top = pc.is_in(yearly_data['domestic_competition_id'], value_set=top_n_ids.combine_chunks())
+    top_leagues = yearly_data.filter(is_top)
 
-    yearly_data_total['league_label'] = (
-    yearly_data_total['competition_name'] + " (" + yearly_data_total['country_name'] + ")"
-    )
+    competition_name = pc.utf8_title(pc.replace_substring(top_leagues['competition_name'], '-', ' '))
+    top_leagues = pa.table({
+        'domestic_competition_id': top_leagues['domestic_competition_id'],
+        'year': top_leagues['year'],
+        statistic: top_leagues[statistic],
+        'league_label': pc.binary_join_element_wise(
+            competition_name, ' (', top_leagues['country_name'], ')', ''
+        ),
+    })
 
-    output_path_all = plot_leagues(
-        yearly_data_total,
-        groupby_columns=['league_label', 'domestic_competition_id'],
-        statistic='total_valuation',
-        output_path="first_league_valuation_evolution.png",
-        set_ylabel='Total Valuation (EUR)',
-        set_xlabel='Year',
-        set_title='Market Value of All Players In The League',
-    )
+    other_total = yearly_data.filter(pc.invert(is_top)).group_by('year').aggregate([(statistic, 'max')])
+    other_leagues_count = total_leagues_count - len(top_n_ids)
+    other_total = pa.table({
+        'domestic_competition_id': pa.array(['Other'] * other_total.num_rows),
+        'year': other_total['year'],
+        statistic: other_total[f'{statistic}_max'],
+        'league_label': pa.array([f'Other ({other_leagues_count})'] * other_total.num_rows),
+    })
 
+    return pa.concat_tables([top_leagues, other_total], promote_options='permissive')
 
-    yearly_data_max = yearly_data[yearly_data['domestic_competition_id'].isin(top_n_ids_max)]
-    other_total = yearly_data[~yearly_data['domestic_competition_id'].isin(top_n_ids_max)].groupby('year').agg(
-        max_valuation=('max_valuation', 'max'),
-    ).reset_index()
 
-    other_leagues_count = total_leagues_count - len(top_n_ids_max)
-    other_total['domestic_competition_id'] = 'Other'
-    other_total['competition_name'] = 'Other'
-    other_total['country_name'] = str(other_leagues_count)
-    yearly_data_max = pd.concat([yearly_data_max, other_total], ignore_index=True)
+def _league_logo_paths(yearly_data, logos_path: str) -> list:
+    """
+    The logo files a league chart reads, so a changed logo redraws it.
+    """
+    competition_ids = set(yearly_data['domestic_competition_id']) | {"default"}
+    return [logos_path.format(competition_id) for competition_id in competition_ids]
 
-    yearly_data_max['league_label'] = (
-    yearly_data_max['competition_name'] + " (" + yearly_data_max['country_name'] + ")"
-    )
 
-    output_path_max = plot_leagues(
-        yearly_data_max,
-        groupby_columns=['league_label', 'domestic_competition_id'],
-        statistic='max_valuation',
-        output_path="first_league_max_valuation_evolution.png",
-        set_ylabel='Player Valuation (EUR)',
-        set_xlabel='Year',
-        set_title='Maximum Market Value of The Players In The League',
-        step=1_000_000
-    )
+@dg.asset(
+        deps=["league_valuation_yearly_db",
+              "league_logos"],
+        group_name="reports"
+)
+@instrumented
+def first_league_valuation(
+    database: SerializedDuckDBResource,
+    storage: StorageResource,
+):
+    """
+    creates a graph showing the evolution of first leagues valuations evolution over time.
+    """
+    # The charts are drawn by utils.plot; only the dispatcher is imported here.
+    from utils.charts import preview_markdown, render_charts
 
-    with open(output_path_all, 'rb') as file:
-        image_data = file.read()
+    query = """
+        select
+            lvy.domestic_competition_id,
+            lvy.year,
+            lvy.total_valuation,
+            lvy.max_valuation,
+            fc.name as competition_name,
+            fc.country_name
+        from
+            league_valuation_yearly as lvy
+        join competitions as fc
+            on lvy.domestic_competition_id = fc.competition_id
+        where fc.sub_type = 'first_tier'
+            and lvy.year < 2025
+        order by
+            lvy.year asc;
+    """
 
-    base64_data = base64.b64encode(image_data).decode('utf-8')
-    md_content = f"![Image](data:image/jpeg;base64,{base64_data})"
+    with database.get_read_connection() as conn:
+        yearly_data = conn.execute(query).fetch_arrow_table()
 
-    with open(output_path_max, 'rb') as file:
-        image_data = file.read()
+    if yearly_data.num_rows == 0:
+        return
 
-    base64_data = base64.b64encode(image_data).decode('utf-8')
-    md_content += f"\n![Image](data:image/jpeg;base64,{base64_data})"
+    # pandas is only materialized for the small plotting frames.
+    yearly_data_total = _top_leagues_with_other(yearly_data, 'total_valuation', 5).to_pandas()
+    yearly_data_max = _top_leagues_with_other(yearly_data, 'max_valuation', 7).to_pandas()
+
+    logos_path = storage.path(constants.LEAGUE_LOGOS_PATH)
+    output_path_all = storage.path(constants.CHART_OUTPUT_PATH).format("first_league_valuation_evolution")
+    output_path_max = storage.path(constants.CHART_OUTPUT_PATH).format("first_league_max_valuation_evolution")
+
+    render_charts([
+        {
+            "plot": "plot_leagues",
+            "data": yearly_data_total,
+            "output_path": output_path_all,
+            "options": {
+                "groupby_columns": ['league_label', 'domestic_competition_id'],
+                "statistic": 'total_valuation',
+                "set_ylabel": 'Total Valuation (EUR)',
+                "set_xlabel": 'Year',
+                "set_title": 'Market Value of All Players In The League',
+                "logos_path": logos_path,
+            },
+            "files": _league_logo_paths(yearly_data_total, logos_path),
+        },
+        {
+            "plot": "plot_leagues",
+            "data": yearly_data_max,
+            "output_path": output_path_max,
+            "options": {
+                "groupby_columns": ['league_label', 'domestic_competition_id'],
+                "statistic": 'max_valuation',
+                "set_ylabel": 'Player Valuation (EUR)',
+                "set_xlabel": 'Year',
+                "set_title": 'Maximum Market Value of The Players In The League',
+                "step": 1_000_000,
+                "logos_path": logos_path,
+            },
+            "files": _league_logo_paths(yearly_data_max, logos_path),
+        },
+    ], max_workers=constants.CHART_RENDER_WORKERS)
 
     return dg.MaterializeResult(
-    metadata={
-        "preview": dg.MetadataValue.md(md_content)
-    }
-)
+        metadata={
+            "preview": dg.MetadataValue.md(preview_markdown([output_path_all, output_path_max])),
+            "total_valuation_chart": dg.MetadataValue.path(os.path.abspath(output_path_all)),
+            "max_valuation_chart": dg.MetadataValue.path(os.path.abspath(output_path_max)),
+        }
+    )
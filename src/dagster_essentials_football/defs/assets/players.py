@@ -1,65 +1,151 @@
+import os
+
 import dagster as dg
 from dagster_duckdb import DuckDBResource
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from matplotlib.ticker import FuncFormatter
+
+from dagster_essentials_football.defs.partitions import monthly_partition
+from dagster_essentials_football.defs.resources import SerializedDuckDBResource
+from dagster_essentials_football.defs.storage import StorageResource
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.assets.football import PLAYER_VALUATION_CHANGES_DDL
+from dagster_essentials_football.defs.assets.instrumentation import instrumented
+
 
 @dg.asset(
-    deps=["player_valuations_db",
-          "football_players_db"]
+    partitions_def=monthly_partition,
+    deps=["player_valuations_db"],
+    group_name="persisted",
+    pool=constants.DUCKDB_WRITER_POOL,
+    backfill_policy=dg.BackfillPolicy.single_run(),
 )
-def player_valuation_stats_to_json(
+@instrumented
+def player_valuation_summary_db(
+    context: dg.AssetExecutionContext,
     database: DuckDBResource,
 ) -> None:
     """
-    Calculates and stores player valuation metrics in the database.
+    Maintains a running valuation summary per player. Only the players valued
+    in the requested months are recomputed, together with the players whose
+    valuations `player_valuations_db` replaced, so reloading a month stays
+    idempotent and players left without valuations are removed.
+    """
+    months_to_fetch = [partition_key[:-3] for partition_key in context.partition_keys]
+    query = f"""
+        create table if not exists player_valuation_summary (
+            player_id integer,
+            valuation_count integer,
+            valuation_sum double,
+            min_valuation float,
+            max_valuation float,
+            latest_date date,
+            latest_club_id integer
+        );
+        {PLAYER_VALUATION_CHANGES_DDL}
+
+        begin transaction;
+
+        create or replace temp table affected_players as
+        select player_id
+        from player_valuations
+        where partition_date between '{months_to_fetch[0]}' and '{months_to_fetch[-1]}'
+        union
+        select player_id
+        from player_valuation_changes;
+
+        delete from player_valuation_summary
+        where player_id in (select player_id from affected_players);
+
+        delete from player_valuation_changes;
+
+        insert into player_valuation_summary
+        select
+            v.player_id,
+            count(v.market_value) as valuation_count,
+            sum(v.market_value) as valuation_sum,
+            min(v.market_value) as min_valuation,
+            max(v.market_value) as max_valuation,
+            max(v.date) as latest_date,
+            arg_max(v.current_club_id, v.date) as latest_club_id
+        from
+            player_valuations v
+        semi join affected_players a
+            on v.player_id = a.player_id
+        group by
+            v.player_id;
+
+        commit;
+    """
+
+    with database.get_connection() as conn:
+        conn.execute(query)
+
+
+@dg.asset(
+    deps=["player_valuation_summary_db",
+          "football_players_db",
+          "football_clubs_db"],
+    group_name="reports",
+    io_manager_key="arrow_io_manager",
+)
+@instrumented
+def top_player_valuations(
+    database: SerializedDuckDBResource,
+):
+    """
+    The top 100 players by average valuation, served from the player
+    valuation summary and stored as an Arrow table (a pyarrow.Table; not
+    annotated, so loading the definitions does not import pyarrow).
     """
     query = """
         select
             p.player_id,
             p.name,
-            avg(v.market_value) as avg_valuation,
-            max(v.market_value) as max_valuation,
-            min(v.market_value) as min_valuation,
+            s.valuation_sum / s.valuation_count as avg_valuation,
+            s.max_valuation,
+            s.min_valuation,
             c.name as club_name
             from
-            player_valuations v
+            player_valuation_summary s
             join players p
-            on v.player_id = p.player_id
+            on s.player_id = p.player_id
             join clubs c
-            on v.current_club_id = c.club_id
-            group by
-            p.player_id,
-            p.name,
-            c.name
+            on s.latest_club_id = c.club_id
             order by
             avg_valuation desc
             limit 100;
         """
-    with database.get_connection() as conn:
-        result = conn.execute(query).fetch_df()
-    
-    unique_clubs = result['club_name'].unique()
-    
-    cmap = plt.cm.get_cmap('tab20', len(unique_clubs))
-    color_map = {club: cmap(i) for i, club in enumerate(unique_clubs)}
-    colors = result['club_name'][::-1].map(color_map)
-    fig, ax = plt.subplots(figsize=(12, 30)) 
-    
-    ax.barh(result['name'][::-1], result['avg_valuation'][::-1], color=colors)
-    
-    ax.set_xlabel('Average Valuation (EUR)')
-    ax.set_title('Top 100 Players by Average Valuation')
-    
-    formatter = FuncFormatter(lambda x, pos: f'{x / 1_000_000:.0f}M')
-    ax.xaxis.set_major_formatter(formatter)
-
-    ax.tick_params(axis='y', labelsize=8)
-    patches = [mpatches.Patch(color=color_map[club], label=club) for club in unique_clubs]
-    ax.legend(handles=patches, bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
-    
-    output_path = "data/outputs/top_100_player_valuations.png"
-    plt.savefig(output_path, bbox_inches='tight')
\ No newline at end of file
+    with database.get_read_connection() as conn:
+        return conn.execute(query).fetch_arrow_table()
+
+
+@dg.asset(
+    ins={
+        "top_player_valuations": dg.AssetIn(
+            metadata={"columns": ["name", "avg_valuation", "club_name"]},
+        ),
+    },
+)
+@instrumented
+def player_valuation_stats_to_json(
+    top_player_valuations,
+    storage: StorageResource,
+) -> dg.MaterializeResult:
+    """
+    Plots the top 100 players by average valuation, given as a pyarrow.Table.
+    """
+    # The chart is drawn by utils.plot; only the dispatcher is imported here.
+    from utils.charts import preview_markdown, render_charts
+
+    output_path = storage.path(constants.CHART_OUTPUT_PATH).format("top_100_player_valuations")
+    render_charts([{
+        "plot": "plot_top_players",
+        "data": top_player_valuations.to_pandas(),
+        "output_path": output_path,
+    }])
+
+    return dg.MaterializeResult(
+        metadata={
+            "preview": dg.MetadataValue.md(preview_markdown([output_path])),
+            "chart": dg.MetadataValue.path(os.path.abspath(output_path)),
+        }
+    )
@@ -0,0 +1,122 @@
+# Explicit DuckDB column types of the Kaggle CSV files, used instead of type
+# inference when the raw files are converted to Parquet. Integer columns use
+# the narrowest width that fits the Transfermarkt value ranges.
+
+PLAYER_VALUATIONS_SCHEMA = {
+    "player_id": "INTEGER",
+    "date": "DATE",
+    "market_value_in_eur": "INTEGER",
+    "current_club_id": "INTEGER",
+    "player_club_domestic_competition_id": "VARCHAR",
+}
+
+PLAYER_APPEARANCES_SCHEMA = {
+    "appearance_id": "VARCHAR",
+    "game_id": "INTEGER",
+    "player_id": "INTEGER",
+    "player_club_id": "INTEGER",
+    "player_current_club_id": "INTEGER",
+    "date": "DATE",
+    "player_name": "VARCHAR",
+    "competition_id": "VARCHAR",
+    "yellow_cards": "TINYINT",
+    "red_cards": "TINYINT",
+    "goals": "TINYINT",
+    "assists": "TINYINT",
+    "minutes_played": "SMALLINT",
+}
+
+COMPETITIONS_SCHEMA = {
+    "competition_id": "VARCHAR",
+    "competition_code": "VARCHAR",
+    "name": "VARCHAR",
+    "sub_type": "VARCHAR",
+    "type": "VARCHAR",
+    "country_id": "SMALLINT",
+    "country_name": "VARCHAR",
+    "domestic_league_code": "VARCHAR",
+    "confederation": "VARCHAR",
+    "url": "VARCHAR",
+    "is_major_national_league": "BOOLEAN",
+}
+
+PLAYERS_SCHEMA = {
+    "player_id": "INTEGER",
+    "first_name": "VARCHAR",
+    "last_name": "VARCHAR",
+    "name": "VARCHAR",
+    "last_season": "SMALLINT",
+    "current_club_id": "INTEGER",
+    "player_code": "VARCHAR",
+    "country_of_birth": "VARCHAR",
+    "city_of_birth": "VARCHAR",
+    "country_of_citizenship": "VARCHAR",
+    "date_of_birth": "DATE",
+    "sub_position": "VARCHAR",
+    "position": "VARCHAR",
+    "foot": "VARCHAR",
+    "height_in_cm": "SMALLINT",
+    "contract_expiration_date": "DATE",
+    "agent_name": "VARCHAR",
+    "image_url": "VARCHAR",
+    "url": "VARCHAR",
+    "current_club_domestic_competition_id": "VARCHAR",
+    "current_club_name": "VARCHAR",
+    "market_value_in_eur": "INTEGER",
+    "highest_market_value_in_eur": "INTEGER",
+}
+
+CLUBS_SCHEMA = {
+    "club_id": "INTEGER",
+    "club_code": "VARCHAR",
+    "name": "VARCHAR",
+    "domestic_competition_id": "VARCHAR",
+    "total_market_value": "BIGINT",
+    "squad_size": "SMALLINT",
+    "average_age": "FLOAT",
+    "foreigners_number": "SMALLINT",
+    "foreigners_percentage": "FLOAT",
+    "national_team_players": "SMALLINT",
+    "stadium_name": "VARCHAR",
+    "stadium_seats": "INTEGER",
+    "net_transfer_record": "VARCHAR",
+    "coach_name": "VARCHAR",
+    "last_season": "SMALLINT",
+    "filename": "VARCHAR",
+    "url": "VARCHAR",
+}
+
+GAMES_SCHEMA = {
+    "game_id": "INTEGER",
+    "competition_id": "VARCHAR",
+    "season": "SMALLINT",
+    "round": "VARCHAR",
+    "date": "DATE",
+    "home_club_id": "INTEGER",
+    "away_club_id": "INTEGER",
+    "home_club_goals": "TINYINT",
+    "away_club_goals": "TINYINT",
+    "home_club_position": "SMALLINT",
+    "away_club_position": "SMALLINT",
+    "home_club_manager_name": "VARCHAR",
+    "away_club_manager_name": "VARCHAR",
+    "stadium": "VARCHAR",
+    "attendance": "INTEGER",
+    "referee": "VARCHAR",
+    "url": "VARCHAR",
+    "home_club_formation": "VARCHAR",
+    "away_club_formation": "VARCHAR",
+    "home_club_name": "VARCHAR",
+    "away_club_name": "VARCHAR",
+    "aggregate": "VARCHAR",
+    "competition_type": "VARCHAR",
+}
+
+# Low-cardinality columns stored as DuckDB ENUMs in the warehouse tables. The
+# ENUM values are built from the distinct values of each load.
+ENUM_COLUMNS = {
+    "competitions": ["sub_type", "type", "confederation"],
+    "players": ["sub_position", "position", "foot"],
+    "clubs": [],
+    "games": ["competition_type"],
+}
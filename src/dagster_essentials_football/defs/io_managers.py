@@ -0,0 +1,154 @@
+import os
+from typing import Optional
+
+import dagster as dg
+from upath import UPath
+
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.storage import StorageResource
+
+FILE_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _is_local(path: UPath) -> bool:
+    return getattr(path, "protocol", "") in ("", "file", "local")
+
+
+class ArrowUPathIOManager(dg.UPathIOManager):
+    """
+    Stores Arrow tables under `base_path/<asset key>/<partition key>` as
+    Parquet or as uncompressed Arrow IPC files, which are read memory-mapped
+    without deserializing them.
+
+    Inputs load only the columns listed in their `columns` metadata, and
+    several upstream partitions load as one table. pandas DataFrames are
+    accepted as outputs and returned for inputs annotated as DataFrames.
+    Outputs of runs covering several partitions (single-run backfills) are
+    given as {partition_key: table}.
+    """
+
+    def __init__(self, base_path: UPath, file_format: str = "parquet"):
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unknown file format {file_format!r}, expected one of {list(FILE_FORMATS)}.")
+        self.file_format = file_format
+        self.extension = FILE_FORMATS[file_format]
+        super().__init__(base_path=base_path)
+
+    def handle_output(self, context: dg.OutputContext, obj) -> None:
+        if not context.has_asset_partitions or len(context.asset_partition_keys) == 1:
+            return super().handle_output(context, obj)
+
+        if not isinstance(obj, dict):
+            raise TypeError(
+                f"{context.asset_key.to_user_string()} covers {len(context.asset_partition_keys)} partitions "
+                "in this run and has to return a dict of {partition_key: table}."
+            )
+        rows = 0
+        for partition_key, path in self._get_paths_for_partitions(context).items():
+            self.make_directory(path.parent)
+            self.dump_to_path(context, obj[partition_key], path)
+            rows += obj[partition_key].num_rows if hasattr(obj[partition_key], "num_rows") else len(obj[partition_key])
+        context.add_output_metadata({
+            "path": dg.MetadataValue.path(str(self._get_path_without_extension(context))),
+            "dagster/row_count": rows,
+        })
+
+    def dump_to_path(self, context: dg.OutputContext, obj, path: UPath) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not isinstance(obj, (pa.Table, pa.RecordBatchReader)):
+            # pandas DataFrames
+            obj = pa.Table.from_pandas(obj, preserve_index=False)
+
+        # Local files are written next to their destination and swapped in,
+        # so readers never see a half-written file.
+        target = path.with_name(f".{path.name}.tmp") if _is_local(path) else path
+        with target.open("wb") as sink:
+            if self.file_format == "parquet":
+                with pq.ParquetWriter(sink, obj.schema, compression="zstd") as writer:
+                    if isinstance(obj, pa.Table):
+                        writer.write_table(obj, row_group_size=constants.RAW_ROW_GROUP_SIZE)
+                    else:
+                        for batch in obj:
+                            writer.write_batch(batch)
+            else:
+                with pa.ipc.new_file(sink, obj.schema) as writer:
+                    if isinstance(obj, pa.Table):
+                        writer.write_table(obj)
+                    else:
+                        for batch in obj:
+                            writer.write_batch(batch)
+        if target is not path:
+            os.replace(target.path, path.path)
+
+    def get_metadata(self, context: dg.OutputContext, obj) -> dict:
+        if hasattr(obj, "num_rows"):
+            return {"dagster/row_count": obj.num_rows}
+        return {}
+
+    def load_from_path(self, context: dg.InputContext, path: UPath):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = (context.definition_metadata or {}).get("columns")
+
+        if self.file_format == "parquet":
+            if _is_local(path):
+                table = pq.read_table(path.path, columns=columns, memory_map=True)
+            else:
+                with path.open("rb") as source:
+                    table = pq.read_table(source, columns=columns)
+        else:
+            if _is_local(path):
+                # Zero-copy: the table's buffers point into the mapped file.
+                table = pa.ipc.open_file(pa.memory_map(path.path)).read_all()
+            else:
+                with path.open("rb") as source:
+                    table = pa.ipc.open_file(source).read_all()
+            if columns:
+                table = table.select(columns)
+
+        return self._as_input_type(context, table)
+
+    def load_input(self, context: dg.InputContext):
+        if not context.has_asset_key or not context.has_asset_partitions or len(context.asset_partition_keys) <= 1:
+            return super().load_input(context)
+
+        import pyarrow as pa
+
+        tables = [
+            self.load_from_path(context, path)
+            for path in self._get_paths_for_partitions(context).values()
+        ]
+        if not tables:
+            return None
+        if not isinstance(tables[0], pa.Table):
+            import pandas as pd
+
+            return pd.concat(tables, ignore_index=True)
+        return pa.concat_tables(tables)
+
+    @staticmethod
+    def _as_input_type(context: dg.InputContext, table):
+        typing_type = context.dagster_type.typing_type
+        if getattr(typing_type, "__module__", "").startswith("pandas"):
+            return table.to_pandas()
+        return table
+
+
+class ArrowIOManager(dg.ConfigurableIOManagerFactory):
+    """
+    IO manager handing Arrow tables (or pandas DataFrames) between assets.
+    Tables are stored under `base_path`, a local directory or an fsspec URL,
+    which defaults to `ARROW_STORAGE_PATH` under the storage root.
+    `file_format` is "parquet" or "arrow" (memory-mapped Arrow IPC).
+    """
+
+    storage: StorageResource
+    base_path: Optional[str] = None
+    file_format: str = "parquet"
+
+    def create_io_manager(self, context) -> ArrowUPathIOManager:
+        base_path = self.base_path or self.storage.path(constants.ARROW_STORAGE_PATH)
+        return ArrowUPathIOManager(base_path=UPath(base_path), file_format=self.file_format)
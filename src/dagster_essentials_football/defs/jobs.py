@@ -0,0 +1,65 @@
+import dagster as dg
+from dagster_duckdb import DuckDBResource
+
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.assets.football import _create_indexes_sql
+
+valuation_partitions_job = dg.define_asset_job(
+    name="valuation_partitions_job",
+    selection=[
+        "monthly_player_valuations",
+        "player_valuations_db",
+        "player_valuation_summary_db",
+        "league_valuation_evolution_db",
+        "league_valuation_yearly_db",
+        "club_valuation_evolution_db",
+        "squad_valuation_timeline_db",
+        "rebuilt_valuation_fingerprints_db",
+    ],
+)
+
+appearance_partitions_job = dg.define_asset_job(
+    name="appearance_partitions_job",
+    selection=[
+        "monthly_player_appearances",
+        "player_appearances_db",
+        "rebuilt_appearance_fingerprints_db",
+    ],
+)
+
+
+@dg.op(pool=constants.DUCKDB_WRITER_POOL)
+def recluster_player_tables(context: dg.OpExecutionContext, database: DuckDBResource) -> None:
+    """
+    Rewrites the fact tables in their cluster order. Month reloads append
+    their rows at the end of the table, so over time the zone maps on `date`
+    stop pruning; a rewrite restores them and compacts deleted rows.
+    """
+    with database.get_connection() as conn:
+        existing_tables = {
+            row[0] for row in conn.execute("select table_name from duckdb_tables()").fetchall()
+        }
+
+        for table_name, cluster_keys in constants.CLUSTER_KEYS.items():
+            if table_name not in existing_tables:
+                context.log.info(f"Skipping {table_name}, it has not been loaded yet.")
+                continue
+
+            conn.execute(f"""
+                begin transaction;
+
+                create or replace table {table_name} as
+                select * from {table_name}
+                order by {cluster_keys};
+                {_create_indexes_sql(table_name)}
+
+                commit;
+            """)
+            context.log.info(f"Reclustered {table_name} by {cluster_keys}.")
+
+        conn.execute("checkpoint")
+
+
+@dg.job
+def recluster_job():
+    recluster_player_tables()
@@ -7,4 +7,45 @@ end_date = constants.END_DATE
 monthly_partition = dg.MonthlyPartitionsDefinition(
     start_date=start_date,
     end_date=end_date
-)
\ No newline at end of file
+)
+
+# Filled from the competitions table by `football_competitions_db`.
+domestic_competition_partition = dg.DynamicPartitionsDefinition(name="domestic_competitions")
+
+monthly_competition_partition = dg.MultiPartitionsDefinition({
+    "month": monthly_partition,
+    "competition": domestic_competition_partition,
+})
+
+
+def competition_month_slices(partition_keys: list) -> tuple:
+    """
+    Returns the (partition_date, domestic_competition_id) pairs of a run of
+    `monthly_competition_partition` as a VALUES list, and the date range they
+    cover.
+    """
+    slices = []
+    for partition_key in partition_keys:
+        keys_by_dimension = monthly_competition_partition.get_partition_key_from_str(
+            partition_key
+        ).keys_by_dimension
+        slices.append((keys_by_dimension["month"], keys_by_dimension["competition"]))
+
+    months = sorted(month for month, _ in slices)
+    end_date = monthly_partition.time_window_for_partition_key(months[-1]).end
+    values = ", ".join(f"('{month}', '{competition_id}')" for month, competition_id in slices)
+    return values, months[0], end_date.strftime(constants.DATE_FORMAT)
+
+
+# The clubs of the run's competitions, so the valuations are joined to those
+# clubs only, and the filter keeping the valuations `v` of clubs `c` that fall
+# in one of the run's slices. Both read the `partition_slices` temp table
+# loaded from the VALUES list above.
+COMPETITION_SLICE_CLUBS = """(
+            select * from clubs
+            where domestic_competition_id in (select domestic_competition_id from partition_slices)
+        )"""
+COMPETITION_SLICE_FILTER = """
+        semi join partition_slices as s
+            on c.domestic_competition_id = s.domestic_competition_id
+            and strftime(date_trunc('month', v.date), '%Y-%m-%d') = s.partition_date"""
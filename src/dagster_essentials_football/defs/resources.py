@@ -1,10 +1,205 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
 import dagster as dg
+import duckdb
 from dagster_duckdb import DuckDBResource
 
-db_resource = DuckDBResource(
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.assets.instrumentation import instrument_connection
+from dagster_essentials_football.defs.io_managers import ArrowIOManager
+from dagster_essentials_football.defs.storage import StorageResource
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def _exclusive_file_lock(lock_path: str, blocking: bool = True):
+    """
+    Holds an exclusive lock on `lock_path` that is shared by all processes
+    (and threads) on the machine, blocking until it is free. With
+    `blocking=False` it yields False instead of waiting for a held lock.
+    """
+    with open(lock_path, "a+b") as lock_file:
+        if os.name == "nt":
+            lock_file.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after ~10 seconds, so keep asking.
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    if not blocking:
+                        yield False
+                        return
+        else:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+
+        try:
+            yield True
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+SNAPSHOT_SUFFIXES = ["", ".wal"]
+
+
+def _database_state(database: str) -> tuple:
+    """
+    The modification time and size of the database and its WAL; any write
+    changes it.
+    """
+    state = []
+    for suffix in SNAPSHOT_SUFFIXES:
+        try:
+            stat = os.stat(database + suffix)
+            state.append((stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            state.append(None)
+    return tuple(state)
+
+
+def _snapshot_is_current(database: str, snapshot_path: str) -> bool:
+    return (
+        os.path.exists(snapshot_path)
+        and os.path.getmtime(snapshot_path) == os.path.getmtime(database)
+    )
+
+
+def _copy_database(database: str, snapshot_path: str) -> dict:
+    """
+    Copies the database and its WAL to temp files next to the snapshot and
+    returns them by suffix.
+    """
+    copies = {}
+    for suffix in SNAPSHOT_SUFFIXES:
+        if os.path.exists(database + suffix):
+            fd, copies[suffix] = tempfile.mkstemp(
+                prefix=os.path.basename(snapshot_path + suffix) + ".",
+                suffix=".tmp",
+                dir=os.path.dirname(os.path.abspath(snapshot_path)),
+            )
+            os.close(fd)
+            shutil.copy2(database + suffix, copies[suffix])
+    return copies
+
+
+def _remove_files(paths) -> None:
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def refresh_snapshot(database: str, blocking: bool = True) -> bool:
+    """
+    Copies `database` to `{database}.snapshot` if it changed since the last
+    copy, and returns whether the snapshot is now current.
+
+    The files are copied without holding the writer lock, so a load that
+    starts meanwhile does not wait for the copy. The copy is only swapped in
+    if no write happened while it was taken. Without `blocking`, a running or
+    interleaved write makes it return False and keeps the old snapshot. With
+    `blocking`, it waits for the writer and copies again under the lock.
+    """
+    snapshot_path = f"{database}.snapshot"
+    lock_path = f"{database}.lock"
+
+    with _exclusive_file_lock(lock_path, blocking=blocking) as locked:
+        if not locked:
+            return False
+        if _snapshot_is_current(database, snapshot_path):
+            return True
+        state = _database_state(database)
+
+    copies = _copy_database(database, snapshot_path)
+    try:
+        with _exclusive_file_lock(lock_path, blocking=blocking) as locked:
+            if not locked:
+                return False
+            if _database_state(database) != state:
+                if not blocking:
+                    return False
+                _remove_files(copies.values())
+                copies = _copy_database(database, snapshot_path)
+
+            # Readers with the old snapshot open keep reading it.
+            for suffix in SNAPSHOT_SUFFIXES:
+                if suffix in copies:
+                    os.replace(copies.pop(suffix), snapshot_path + suffix)
+                elif os.path.exists(snapshot_path + suffix):
+                    os.remove(snapshot_path + suffix)
+        return True
+    finally:
+        _remove_files(copies.values())
+
+
+class SerializedDuckDBResource(DuckDBResource):
+    """
+    DuckDB resource that hands out write connections one at a time across
+    processes, so concurrent partition runs queue for DuckDB's single writer
+    instead of failing on its file lock. Reporting assets read from a
+    read-only snapshot of the database that is at least as new as the
+    last committed write.
+    Inside instrumented assets the connections record their query timings.
+    """
+
+    @contextmanager
+    def get_connection(self):
+        with _exclusive_file_lock(f"{self.database}.lock"):
+            with super().get_connection() as conn:
+                with instrument_connection(conn) as instrumented_conn:
+                    yield instrumented_conn
+
+    @contextmanager
+    def get_read_connection(self):
+        """
+        Opens a read-only connection on a copy of the database taken between
+        two writes. The copy is refreshed only when the database changed.
+        """
+        # Assets have to see the writes of their upstream assets, so a stale
+        # snapshot is never read here: a running load is waited for and the
+        # copy is taken after it. The dashboard queries (query_api) read the
+        # previous snapshot instead.
+        snapshot_path = f"{self.database}.snapshot"
+        refresh_snapshot(self.database, blocking=True)
+
+        conn = duckdb.connect(snapshot_path, read_only=True)
+        try:
+            with instrument_connection(conn) as instrumented_conn:
+                yield instrumented_conn
+        finally:
+            conn.close()
+
+
+db_resource = SerializedDuckDBResource(
     database=dg.EnvVar("DUCKDB_DATABASE"),
 )
 
+storage_resource = StorageResource(
+    root=dg.EnvVar(constants.STORAGE_ROOT_ENV),
+)
+
+arrow_io_manager = ArrowIOManager(
+    storage=storage_resource,
+)
+
 @dg.definitions
 def resources():
-    return dg.Definitions(resources={"database": db_resource})
\ No newline at end of file
+    return dg.Definitions(resources={
+        "database": db_resource,
+        "storage": storage_resource,
+        "arrow_io_manager": arrow_io_manager,
+    })
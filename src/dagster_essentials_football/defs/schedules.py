@@ -0,0 +1,10 @@
+import dagster as dg
+
+from dagster_essentials_football.defs.jobs import recluster_job
+
+# Off by default; turn it on once monthly reloads have fragmented the tables.
+recluster_schedule = dg.ScheduleDefinition(
+    job=recluster_job,
+    cron_schedule="0 3 * * 0",
+    default_status=dg.DefaultScheduleStatus.STOPPED,
+)
@@ -0,0 +1,72 @@
+import dagster as dg
+
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.jobs import (
+    appearance_partitions_job,
+    valuation_partitions_job,
+)
+from dagster_essentials_football.defs.partitions import monthly_partition
+
+CHANGED_PARTITION_JOBS = {
+    "player_valuations": valuation_partitions_job,
+    "player_appearances": appearance_partitions_job,
+}
+
+# A changed valuation month also changes the squad valuations of the
+# following months (squad_valuation_timeline_db carries valuations forward).
+TRAILING_MONTHS = {
+    "player_valuations": constants.VALUATION_STALENESS_MONTHS,
+    "player_appearances": 0,
+}
+
+
+def contiguous_partition_ranges(partition_keys: list, trailing_months: int = 0) -> list:
+    """
+    Groups monthly partition keys, each extended by the `trailing_months`
+    after it, into (first, last) ranges of consecutive months.
+    """
+    all_keys = monthly_partition.get_partition_keys()
+    positions = {key: i for i, key in enumerate(all_keys)}
+    covered = sorted({
+        position
+        for key in partition_keys
+        for position in range(positions[key], min(positions[key] + trailing_months + 1, len(all_keys)))
+    })
+    ranges = []
+    for position in covered:
+        if ranges and position == ranges[-1][1] + 1:
+            ranges[-1][1] = position
+        else:
+            ranges.append([position, position])
+    return [(all_keys[first], all_keys[last]) for first, last in ranges]
+
+
+@dg.asset_sensor(
+    asset_key=dg.AssetKey("month_fingerprints_db"),
+    jobs=list(CHANGED_PARTITION_JOBS.values()),
+)
+def changed_month_partitions_sensor(
+    context: dg.SensorEvaluationContext,
+    asset_event: dg.EventLogEntry,
+):
+    """
+    Requests runs of the partitioned assets for the months whose fingerprint
+    changed, so a correction to an old month only rebuilds the months it
+    affects. Runs of consecutive months are merged into one single-run
+    backfill of the range. Valuation ranges also cover the
+    `VALUATION_STALENESS_MONTHS` after each changed month, whose squad
+    valuations still carry its valuations.
+    """
+    metadata = asset_event.asset_materialization.metadata
+
+    for dataset, job in CHANGED_PARTITION_JOBS.items():
+        changed_partitions = metadata[f"{dataset}_changed_partitions"].value
+        for start, end in contiguous_partition_ranges(changed_partitions, TRAILING_MONTHS[dataset]):
+            yield dg.RunRequest(
+                run_key=f"{asset_event.run_id}_{job.name}_{start}_{end}",
+                job_name=job.name,
+                tags={
+                    "dagster/asset_partition_range_start": start,
+                    "dagster/asset_partition_range_end": end,
+                },
+            )
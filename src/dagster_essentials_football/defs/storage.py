@@ -0,0 +1,17 @@
+import os
+
+import dagster as dg
+
+
+class StorageResource(dg.ConfigurableResource):
+    """
+    The local directory every file of the pipeline lives under: the raw and
+    monthly Parquet files, the compacted datasets, logos, charts, the HTTP
+    cache and the Arrow IO manager's tables. The paths in `constants` are
+    relative to it.
+    """
+
+    root: str
+
+    def path(self, relative_path: str) -> str:
+        return os.path.join(self.root, relative_path)
@@ -0,0 +1,241 @@
+"""
+Read-only queries over the DuckDB warehouse for dashboards.
+
+    from dagster_essentials_football.query_api import WarehouseQueries
+
+    queries = WarehouseQueries()
+    queries.league_valuations(competition_ids=["GB1", "ES1"], start_month="2020-01-01")
+
+Results are pyarrow Tables kept in an LRU cache. A cached result is used
+until one of the assets it is read from is materialized again. Queries run on
+the read-only snapshot of the database, so any number of threads and
+processes can read while a load is running, without waiting for the writer.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import dagster as dg
+import duckdb
+import pyarrow as pa
+
+from dagster_essentials_football.defs.assets import constants
+from dagster_essentials_football.defs.resources import refresh_snapshot
+
+
+def _in(column: str, values) -> tuple:
+    return f"{column} in ({', '.join('?' for _ in values)})", list(values)
+
+
+def _where(conditions: list) -> tuple:
+    """
+    Joins (clause, parameters) pairs into a where clause and its parameters.
+    """
+    if not conditions:
+        return "", []
+    clauses = [clause for clause, _ in conditions]
+    parameters = [parameter for _, values in conditions for parameter in values]
+    return "where " + " and ".join(clauses), parameters
+
+
+class WarehouseQueries:
+    """
+    Parameterized queries over the valuation aggregates of the warehouse.
+
+    `database` defaults to DUCKDB_DATABASE. The cache is keyed on the latest
+    materializations recorded by `instance` (DAGSTER_HOME's instance by
+    default). Without an instance it is keyed on the database file's
+    modification time instead.
+    """
+
+    def __init__(self, database: str = None, instance: dg.DagsterInstance = None, cache_size: int = constants.QUERY_CACHE_SIZE):
+        self.database = database or os.environ["DUCKDB_DATABASE"]
+        if instance is None and os.environ.get("DAGSTER_HOME"):
+            instance = dg.DagsterInstance.get()
+        self.instance = instance
+        self.cache_size = cache_size
+        self.stats = {"hits": 0, "misses": 0}
+        self._cache = OrderedDict()
+        self._snapshot_version = {}
+        self._lock = threading.Lock()
+
+    def _version(self, asset_names: tuple) -> tuple:
+        """
+        Identifies the data the assets currently hold: the run and time of
+        their latest materializations.
+        """
+        if self.instance is None:
+            return (os.path.getmtime(self.database),)
+
+        events = self.instance.get_latest_materialization_events(
+            [dg.AssetKey(asset_name) for asset_name in asset_names]
+        )
+        return tuple(
+            (event.run_id, event.timestamp) if event is not None else None
+            for event in events.values()
+        )
+
+    def _query(self, asset_names: tuple, sql: str, parameters: list) -> pa.Table:
+        version = self._version(asset_names)
+        key = (sql, tuple(parameters), version)
+
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._cache[key]
+            self.stats["misses"] += 1
+
+        # The snapshot is refreshed once per new materialization. While a
+        # load holds the writer lock the old snapshot is read, and the
+        # (possibly stale) result is not cached.
+        cacheable = self._snapshot_version.get(asset_names) == version
+        if not cacheable:
+            snapshot_exists = os.path.exists(f"{self.database}.snapshot")
+            cacheable = refresh_snapshot(self.database, blocking=not snapshot_exists)
+
+        with duckdb.connect(f"{self.database}.snapshot", read_only=True) as conn:
+            result = conn.execute(sql, parameters).fetch_arrow_table()
+
+        if cacheable:
+            with self._lock:
+                self._snapshot_version[asset_names] = version
+                self._cache[key] = result
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def league_valuations(self, competition_ids=None, start_month: str = None, end_month: str = None) -> pa.Table:
+        """
+        Monthly valuation totals per domestic league (league_valuation_evolution).
+        Months are partition keys, e.g. "2020-01-01".
+        """
+        conditions = []
+        if competition_ids:
+            conditions.append(_in("domestic_competition_id", competition_ids))
+        if start_month:
+            conditions.append(("partition_date >= ?", [start_month]))
+        if end_month:
+            conditions.append(("partition_date <= ?", [end_month]))
+        where, parameters = _where(conditions)
+
+        return self._query(
+            ("league_valuation_evolution_db",),
+            f"""
+                select *
+                from league_valuation_evolution
+                {where}
+                order by partition_date, domestic_competition_id;
+            """,
+            parameters,
+        )
+
+    def league_yearly_valuations(self, competition_ids=None, start_year: int = None, end_year: int = None) -> pa.Table:
+        """
+        Yearly valuation totals per domestic league (league_valuation_yearly).
+        """
+        conditions = []
+        if competition_ids:
+            conditions.append(_in("domestic_competition_id", competition_ids))
+        if start_year:
+            conditions.append(("year >= ?", [start_year]))
+        if end_year:
+            conditions.append(("year <= ?", [end_year]))
+        where, parameters = _where(conditions)
+
+        return self._query(
+            ("league_valuation_yearly_db",),
+            f"""
+                select *
+                from league_valuation_yearly
+                {where}
+                order by year, domestic_competition_id;
+            """,
+            parameters,
+        )
+
+    def club_valuations(self, club_ids=None, competition_ids=None, start_month: str = None, end_month: str = None) -> pa.Table:
+        """
+        Monthly valuation totals per club (club_valuation_evolution).
+        """
+        conditions = []
+        if club_ids:
+            conditions.append(_in("club_id", club_ids))
+        if competition_ids:
+            conditions.append(_in("domestic_competition_id", competition_ids))
+        if start_month:
+            conditions.append(("partition_date >= ?", [start_month]))
+        if end_month:
+            conditions.append(("partition_date <= ?", [end_month]))
+        where, parameters = _where(conditions)
+
+        return self._query(
+            ("club_valuation_evolution_db",),
+            f"""
+                select *
+                from club_valuation_evolution
+                {where}
+                order by partition_date, club_id;
+            """,
+            parameters,
+        )
+
+    def player_valuations(self, player_ids, start_date: str = None, end_date: str = None) -> pa.Table:
+        """
+        The valuation history of the given players (player_valuations). No
+        players give an empty table.
+        """
+        conditions = [_in("player_id", player_ids) if player_ids else ("false", [])]
+        if start_date:
+            conditions.append(("date >= ?", [start_date]))
+        if end_date:
+            conditions.append(("date <= ?", [end_date]))
+        where, parameters = _where(conditions)
+
+        return self._query(
+            ("player_valuations_db",),
+            f"""
+                select *
+                from player_valuations
+                {where}
+                order by player_id, date;
+            """,
+            parameters,
+        )
+
+    def top_players(self, limit: int = 100, club_ids=None) -> pa.Table:
+        """
+        Players by average valuation (player_valuation_summary), as in the
+        top 100 chart.
+        """
+        conditions = []
+        if club_ids:
+            conditions.append(_in("s.latest_club_id", club_ids))
+        where, parameters = _where(conditions)
+
+        return self._query(
+            ("player_valuation_summary_db", "football_players_db", "football_clubs_db"),
+            f"""
+                select
+                    p.player_id,
+                    p.name,
+                    s.valuation_sum / s.valuation_count as avg_valuation,
+                    s.max_valuation,
+                    s.min_valuation,
+                    c.name as club_name
+                from player_valuation_summary s
+                join players p
+                    on s.player_id = p.player_id
+                join clubs c
+                    on s.latest_club_id = c.club_id
+                {where}
+                order by avg_valuation desc
+                limit ?;
+            """,
+            parameters + [limit],
+        )
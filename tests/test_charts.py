@@ -0,0 +1,47 @@
+import pandas as pd
+from PIL import Image
+
+from dagster_essentials_football.defs.assets import constants
+from utils.charts import preview_markdown, render_charts, thumbnail_path
+
+TOP_PLAYERS = pd.DataFrame({
+    "name": ["Player A", "Player B", "Player C"],
+    "avg_valuation": [90_000_000.0, 60_000_000.0, 30_000_000.0],
+    "club_name": ["Club A", "Club B", "Club A"],
+})
+
+
+def _chart(output_path, data=TOP_PLAYERS) -> dict:
+    return {"plot": "plot_top_players", "data": data, "output_path": str(output_path)}
+
+
+def test_unchanged_charts_are_not_rendered_again(tmp_path):
+    output_path = tmp_path / "top_players.png"
+
+    assert render_charts([_chart(output_path)]) == {str(output_path): True}
+    assert output_path.stat().st_size > 0
+    assert render_charts([_chart(output_path)]) == {str(output_path): False}
+
+    changed = TOP_PLAYERS.assign(avg_valuation=TOP_PLAYERS["avg_valuation"] * 2)
+    assert render_charts([_chart(output_path, changed)]) == {str(output_path): True}
+
+
+def test_charts_render_in_worker_processes(tmp_path):
+    output_paths = [tmp_path / "first.png", tmp_path / "second.png"]
+
+    rendered = render_charts([_chart(path) for path in output_paths], max_workers=2)
+
+    assert rendered == {str(path): True for path in output_paths}
+    assert all(path.stat().st_size > 0 for path in output_paths)
+
+
+def test_previews_embed_only_the_thumbnails(tmp_path):
+    output_path = tmp_path / "top_players.png"
+    render_charts([_chart(output_path)])
+
+    with Image.open(thumbnail_path(str(output_path))) as thumbnail:
+        assert max(thumbnail.size) <= max(constants.THUMBNAIL_SIZE)
+
+    preview = preview_markdown([str(output_path)])
+    assert preview.startswith("![top_players](data:image/png;base64,")
+    assert len(preview) < output_path.stat().st_size
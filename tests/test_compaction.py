@@ -0,0 +1,49 @@
+import os
+
+import duckdb
+
+from dagster_essentials_football.defs.assets import compaction, football
+
+MONTHS = [f"2015-{month:02d}" for month in range(1, 13)]
+
+
+def _write_month(partition_file_path: str, month: str, rows: int) -> None:
+    duckdb.sql(f"""
+        copy (
+            select i as player_id, date '{month}-01' + (i % 28)::integer as date
+            from range({rows}) as t(i)
+        ) to '{partition_file_path.format(month)}' (format parquet);
+    """)
+
+
+def _count(partition_file_path: str, compacted_path: str, months: list) -> int:
+    (count,) = duckdb.sql(
+        f"select count(*) from {football._read_months_sql(months, partition_file_path, compacted_path)}"
+    ).fetchone()
+    return count
+
+
+def test_compacted_years_are_switched_to_new_versions(tmp_path):
+    (tmp_path / "months").mkdir()
+    partition_file_path = str(tmp_path / "months" / "valuations_{}.parquet")
+    compacted_path = str(tmp_path / "compacted")
+    for month in MONTHS:
+        _write_month(partition_file_path, month, 100)
+
+    compaction._compact_closed_years("player_valuations", partition_file_path, compacted_path)
+
+    first_version = football.compacted_versions(compacted_path)["2015"]
+    assert not any(os.path.exists(partition_file_path.format(month)) for month in MONTHS)
+    assert _count(partition_file_path, compacted_path, MONTHS) == 1200
+
+    # A month split again is merged into a new version of its year.
+    _write_month(partition_file_path, "2015-03", 50)
+    assert _count(partition_file_path, compacted_path, MONTHS) == 1150
+
+    compaction._compact_closed_years("player_valuations", partition_file_path, compacted_path)
+
+    second_version = football.compacted_versions(compacted_path)["2015"]
+    assert second_version != first_version
+    assert sorted(entry.name for entry in (tmp_path / "compacted").iterdir() if entry.is_dir()) == [second_version]
+    assert _count(partition_file_path, compacted_path, MONTHS) == 1150
+    assert _count(partition_file_path, compacted_path, ["2015-03"]) == 50
@@ -0,0 +1,76 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import duckdb
+from dagster_duckdb import DuckDBResource
+
+from dagster_essentials_football.defs.assets import fingerprints, football
+from dagster_essentials_football.defs.sensors import contiguous_partition_ranges
+
+MONTHS = [f"2015-{month:02d}" for month in range(1, 7)]
+
+
+def _store_raw_fingerprints(database: DuckDBResource, raw_path: str) -> None:
+    with database.get_connection() as conn:
+        fingerprints._create_fingerprint_tables(conn)
+        conn.execute(f"""
+            delete from month_fingerprints;
+            insert into month_fingerprints
+            select 'player_valuations', *
+            from ({fingerprints._fingerprints_sql(f"read_parquet('{raw_path}')")});
+        """)
+
+
+def _changed(database: DuckDBResource) -> list:
+    with database.get_connection() as conn:
+        return fingerprints._changed_partitions(conn, "player_valuations")
+
+
+def test_months_stay_changed_until_their_rebuild_is_recorded(tmp_path):
+    raw_path = str(tmp_path / "raw.parquet")
+    duckdb.sql(f"""
+        copy (
+            select i as player_id, date '2015-01-01' + (i % 181)::integer as date, i * 1000 as market_value
+            from range(5000) as t(i)
+        ) to '{raw_path}' (format parquet);
+    """)
+    (tmp_path / "months").mkdir()
+    partition_file_path = str(tmp_path / "months" / "valuations_{}.parquet")
+    database = DuckDBResource(database=str(tmp_path / "warehouse.duckdb"))
+
+    _store_raw_fingerprints(database, raw_path)
+    assert _changed(database) == [f"{month}-01" for month in MONTHS]
+
+    # The months were split, but their rebuild failed downstream.
+    football._split_monthly_partitions(
+        SimpleNamespace(
+            partition_time_window=SimpleNamespace(start=datetime(2015, 1, 1), end=datetime(2015, 7, 1)),
+            partition_keys=[f"{month}-01" for month in MONTHS],
+        ),
+        raw_path,
+        partition_file_path,
+    )
+    _store_raw_fingerprints(database, raw_path)
+    assert len(_changed(database)) == len(MONTHS)
+
+    fingerprints._record_rebuilt_fingerprints(
+        database, "player_valuations", MONTHS, partition_file_path, str(tmp_path / "compacted")
+    )
+    assert _changed(database) == []
+
+
+def test_consecutive_months_are_requested_as_one_range():
+    assert contiguous_partition_ranges(
+        ["2015-03-01", "2015-01-01", "2015-02-01", "2016-01-01", "2016-03-01"]
+    ) == [
+        ("2015-01-01", "2015-03-01"),
+        ("2016-01-01", "2016-01-01"),
+        ("2016-03-01", "2016-03-01"),
+    ]
+
+
+def test_valuation_ranges_cover_the_months_their_valuations_carry_into():
+    assert contiguous_partition_ranges(["2020-01-01", "2020-06-01", "2025-11-01"], trailing_months=12) == [
+        ("2020-01-01", "2021-06-01"),
+        ("2025-11-01", "2025-12-01"),
+    ]
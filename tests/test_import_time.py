@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+
+# Time allowed for loading the code location on top of `import dagster`.
+IMPORT_TIME_BUDGET_SECONDS = 1.5
+
+HEAVY_MODULES = [
+    "matplotlib",
+    "seaborn",
+    "bs4",
+    "kagglehub",
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "requests",
+    "utils.plot",
+]
+
+SCRIPT = f"""
+import json, sys, time
+import dagster
+
+start = time.perf_counter()
+from dagster_essentials_football.definitions import defs
+defs()
+elapsed = time.perf_counter() - start
+
+print(json.dumps({{
+    "elapsed": elapsed,
+    "loaded": [m for m in {HEAVY_MODULES!r} if m in sys.modules],
+}}))
+"""
+
+
+def _load_definitions_in_subprocess() -> dict:
+    env = {**os.environ, "DUCKDB_DATABASE": os.environ.get("DUCKDB_DATABASE", "data/staging/data.duckdb")}
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", SCRIPT],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_definitions_do_not_import_heavy_modules():
+    result = _load_definitions_in_subprocess()
+    assert result["loaded"] == []
+
+
+def test_definitions_load_within_budget():
+    result = _load_definitions_in_subprocess()
+    assert result["elapsed"] < IMPORT_TIME_BUDGET_SECONDS
@@ -0,0 +1,16 @@
+from dagster_essentials_football.defs.assets import football, schemas
+
+COPY_OPTIONS = {"order_by": "date", "compression": "zstd", "row_group_size": 122_880}
+
+
+def test_schema_and_copy_option_changes_change_the_data_version():
+    version = football._ingest_version("csv-hash", schemas.PLAYER_VALUATIONS_SCHEMA, COPY_OPTIONS)
+
+    assert version == football._ingest_version("csv-hash", dict(schemas.PLAYER_VALUATIONS_SCHEMA), dict(COPY_OPTIONS))
+    assert version != football._ingest_version("other-hash", schemas.PLAYER_VALUATIONS_SCHEMA, COPY_OPTIONS)
+    assert version != football._ingest_version(
+        "csv-hash", {**schemas.PLAYER_VALUATIONS_SCHEMA, "market_value_in_eur": "DOUBLE"}, COPY_OPTIONS
+    )
+    assert version != football._ingest_version(
+        "csv-hash", schemas.PLAYER_VALUATIONS_SCHEMA, {**COPY_OPTIONS, "order_by": ""}
+    )
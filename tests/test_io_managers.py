@@ -0,0 +1,58 @@
+import dagster as dg
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from dagster_essentials_football.defs.io_managers import ArrowIOManager
+from dagster_essentials_football.defs.storage import StorageResource
+
+months = dg.StaticPartitionsDefinition(["2020-01-01", "2020-02-01"])
+
+
+@dg.asset(
+    partitions_def=months,
+    io_manager_key="arrow_io_manager",
+    backfill_policy=dg.BackfillPolicy.single_run(),
+)
+def monthly_values(context: dg.AssetExecutionContext) -> dict:
+    return {
+        partition_key: pa.table({"month": [partition_key], "value": [index], "unused": ["x"]})
+        for index, partition_key in enumerate(context.partition_keys)
+    }
+
+
+@dg.asset(
+    ins={"monthly_values": dg.AssetIn(metadata={"columns": ["month", "value"]})},
+    io_manager_key="arrow_io_manager",
+)
+def all_values(monthly_values: pa.Table) -> pd.DataFrame:
+    assert monthly_values.column_names == ["month", "value"]
+    return monthly_values.to_pandas()
+
+
+@dg.asset
+def value_total(all_values: pd.DataFrame) -> int:
+    return int(all_values["value"].sum())
+
+
+@pytest.mark.parametrize("file_format", ["parquet", "arrow"])
+def test_tables_are_handed_between_assets(tmp_path, file_format):
+    resources = {"arrow_io_manager": ArrowIOManager(storage=StorageResource(root=str(tmp_path)), file_format=file_format)}
+    assets = [monthly_values, all_values, value_total]
+
+    dg.materialize(
+        assets,
+        selection=["monthly_values"],
+        resources=resources,
+        tags={
+            "dagster/asset_partition_range_start": "2020-01-01",
+            "dagster/asset_partition_range_end": "2020-02-01",
+        },
+    )
+    assert sorted(path.name for path in (tmp_path / "storage" / "monthly_values").iterdir()) == [
+        f"2020-01-01.{file_format}",
+        f"2020-02-01.{file_format}",
+    ]
+
+    result = dg.materialize(assets, selection=["all_values", "value_total"], resources=resources)
+    assert result.output_for_node("value_total") == 1
@@ -0,0 +1,114 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.http_cache import HttpCache
+from utils.logos import fetch_logos
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\n fixture image"
+
+PAGES = {
+    "/wettbewerb/GB1": '<div class="data-header__profile-container"><img src="/logos/GB1.png"></div>',
+    "/wettbewerb/ES1": '<div class="data-header__profile-container"><img src="/logos/ES1.png"></div>',
+    "/wettbewerb/NOLOGO": "<div>no logo here</div>",
+}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path in PAGES:
+            body, content_type = PAGES[self.path].encode(), "text/html"
+        elif self.path.startswith("/logos/"):
+            body, content_type = PNG_BYTES, "image/png"
+        else:
+            self.send_error(404)
+            return
+
+        etag = f'"{hash(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fetch_logos_collects_failures(server_url, tmp_path):
+    (tmp_path / "L1.png").write_bytes(b"existing")
+    competitions = [
+        ("GB1", f"{server_url}/wettbewerb/GB1"),
+        ("ES1", f"{server_url}/wettbewerb/ES1"),
+        ("L1", f"{server_url}/wettbewerb/L1"),
+        ("NOLOGO", f"{server_url}/wettbewerb/NOLOGO"),
+        ("MISSING", f"{server_url}/wettbewerb/MISSING"),
+    ]
+
+    result = fetch_logos(competitions, str(tmp_path / "{}.png"), max_workers=4, timeout=5, retries=0)
+
+    assert sorted(result["fetched"]) == ["ES1", "GB1"]
+    assert result["skipped"] == ["L1"]
+    assert sorted(result["failures"]) == ["MISSING", "NOLOGO"]
+    assert (tmp_path / "GB1.png").read_bytes() == PNG_BYTES
+    assert (tmp_path / "L1.png").read_bytes() == b"existing"
+
+
+def test_fetch_logos_revalidates_through_cache(server_url, tmp_path):
+    competitions = [("GB1", f"{server_url}/wettbewerb/GB1")]
+    image_path_template = str(tmp_path / "{}.png")
+
+    cache = HttpCache(str(tmp_path / "cache"), ttl=0)
+    first = fetch_logos(competitions, image_path_template, cache=cache)
+    assert first["fetched"] == ["GB1"]
+    assert cache.stats == {"hits": 0, "revalidated": 0, "misses": 2}
+
+    cache = HttpCache(str(tmp_path / "cache"), ttl=0)
+    second = fetch_logos(competitions, image_path_template, cache=cache)
+    assert second["unchanged"] == ["GB1"]
+    assert cache.stats == {"hits": 0, "revalidated": 2, "misses": 0}
+
+    cache = HttpCache(str(tmp_path / "cache"), ttl=3600)
+    fetch_logos(competitions, image_path_template, cache=cache)
+    assert cache.stats == {"hits": 2, "revalidated": 0, "misses": 0}
+
+
+def test_http_cache_evicts_least_recently_used(server_url, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"), max_bytes=len(PNG_BYTES))
+    with requests.Session() as session:
+        cache.get(session, f"{server_url}/logos/GB1.png", timeout=5)
+        cache.get(session, f"{server_url}/logos/ES1.png", timeout=5)
+
+    assert len(list((tmp_path / "cache").glob("*.body"))) == 1
+
+
+def test_http_cache_downloads_a_corrupted_body_again(server_url, tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"), ttl=3600)
+    url = f"{server_url}/logos/GB1.png"
+    with requests.Session() as session:
+        cache.get(session, url, timeout=5)
+        (body_path,) = (tmp_path / "cache").glob("*.body")
+        body_path.write_bytes(PNG_BYTES[:10])
+
+        assert cache.get(session, url, timeout=5) == PNG_BYTES
+
+    assert cache.stats == {"hits": 0, "revalidated": 0, "misses": 2}
+    assert body_path.read_bytes() == PNG_BYTES
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import SimpleNamespace
+
+import duckdb
+
+from dagster_essentials_football.defs.assets import football, instrumentation
+
+MONTHS = [f"{year}-{month:02d}" for year in (2015, 2016) for month in range(1, 13)]
+
+
+def _context(months: list) -> SimpleNamespace:
+    start = datetime.strptime(months[0], "%Y-%m")
+    end = datetime.strptime(months[-1], "%Y-%m").replace(day=28)
+    return SimpleNamespace(
+        partition_time_window=SimpleNamespace(start=start, end=end.replace(month=end.month % 12 + 1, year=end.year + end.month // 12, day=1)),
+        partition_keys=[f"{month}-01" for month in months],
+    )
+
+
+def _write_unsorted_raw(path: str) -> None:
+    duckdb.sql(f"""
+        copy (
+            select i as player_id, date '2015-01-01' + (hash(i) % 730)::integer as date
+            from range(50000) as t(i)
+        ) to '{path}' (format parquet);
+    """)
+
+
+def test_months_split_into_several_files_are_merged(tmp_path, monkeypatch):
+    raw_path = str(tmp_path / "raw.parquet")
+    _write_unsorted_raw(raw_path)
+    (tmp_path / "months").mkdir()
+    partition_file_path = str(tmp_path / "months" / "valuations_{}.parquet")
+
+    connect = instrumentation.connect
+
+    def connect_with_few_open_files(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        # Forces DuckDB to write several files per month.
+        conn.execute("set partitioned_write_max_open_files = 2; set partitioned_write_flush_threshold = 1000; set threads = 4;")
+        return conn
+
+    monkeypatch.setattr(instrumentation, "connect", connect_with_few_open_files)
+    football._split_monthly_partitions(_context(MONTHS), raw_path, partition_file_path)
+
+    counts = dict(duckdb.sql(f"""
+        select strftime(date, '%Y-%m'), count(*) from '{raw_path}' group by all
+    """).fetchall())
+    for month in MONTHS:
+        (count,) = duckdb.sql(f"select count(*) from '{partition_file_path.format(month)}'").fetchone()
+        assert count == counts[month]
+    assert [path.name for path in (tmp_path / "months").iterdir() if path.name.startswith("_staging")] == []
+
+
+def test_concurrent_splits_do_not_share_staging(tmp_path):
+    raw_path = str(tmp_path / "raw.parquet")
+    _write_unsorted_raw(raw_path)
+    (tmp_path / "months").mkdir()
+    partition_file_path = str(tmp_path / "months" / "valuations_{}.parquet")
+
+    with ThreadPoolExecutor(max_workers=len(MONTHS)) as pool:
+        list(pool.map(
+            lambda month: football._split_monthly_partitions(_context([month]), raw_path, partition_file_path),
+            MONTHS,
+        ))
+
+    (total,) = duckdb.sql(f"select count(*) from read_parquet('{tmp_path}/months/*.parquet')").fetchone()
+    assert total == 50000
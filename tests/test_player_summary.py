@@ -0,0 +1,55 @@
+import os
+
+import dagster as dg
+import duckdb
+from dagster_duckdb import DuckDBResource
+
+from dagster_essentials_football.defs.assets import constants, football, players
+from dagster_essentials_football.defs.storage import StorageResource
+
+
+def _write_month(partition_file_path: str, month: str, player_ids: list) -> None:
+    duckdb.sql(f"""
+        copy (
+            select
+                player_id,
+                date '{month}-15' as date,
+                1000 * player_id as market_value_in_eur,
+                1 as current_club_id,
+                'GB1' as player_club_domestic_competition_id
+            from unnest({player_ids}) as t(player_id)
+        ) to '{partition_file_path.format(month)}' (format parquet);
+    """)
+
+
+def _materialize(database: DuckDBResource, storage: StorageResource, month: str) -> None:
+    result = dg.materialize(
+        [football.player_valuations_db, players.player_valuation_summary_db],
+        partition_key=f"{month}-01",
+        resources={"database": database, "storage": storage},
+    )
+    assert result.success
+
+
+def test_players_moved_out_of_a_reloaded_month_are_recomputed(tmp_path):
+    storage = StorageResource(root=str(tmp_path))
+    partition_file_path = storage.path(constants.PLAYER_VALUATIONS_FILE_PATH)
+    (tmp_path / os.path.dirname(constants.PLAYER_VALUATIONS_FILE_PATH)).mkdir(parents=True)
+    database = DuckDBResource(database=str(tmp_path / "warehouse.duckdb"))
+
+    _write_month(partition_file_path, "2020-01", [1, 2])
+    _write_month(partition_file_path, "2020-02", [2])
+    _materialize(database, storage, "2020-01")
+    _materialize(database, storage, "2020-02")
+
+    # Player 1 loses all valuations, player 2 loses the January one.
+    _write_month(partition_file_path, "2020-01", [3])
+    _materialize(database, storage, "2020-01")
+
+    with database.get_connection() as conn:
+        summary = conn.execute("""
+            select player_id, valuation_count
+            from player_valuation_summary
+            order by player_id
+        """).fetchall()
+    assert summary == [(2, 1), (3, 1)]
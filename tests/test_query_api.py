@@ -0,0 +1,63 @@
+import dagster as dg
+import duckdb
+
+from dagster_essentials_football.defs.resources import _exclusive_file_lock
+from dagster_essentials_football.query_api import WarehouseQueries
+
+
+def _write(database: str, sql: str) -> None:
+    with duckdb.connect(database) as conn:
+        conn.execute(sql)
+
+
+def test_results_are_cached_until_the_asset_is_materialized_again(tmp_path):
+    database = str(tmp_path / "data.duckdb")
+    _write(database, """
+        create table league_valuation_evolution as
+        select * from (values
+            ('GB1', 100.0, 1.0, 50.0, 10, '2020-01-01'),
+            ('ES1', 80.0, 1.0, 40.0, 10, '2020-01-01')
+        ) as t(domestic_competition_id, total_valuation, min_valuation, max_valuation, player_count, partition_date);
+    """)
+    instance = dg.DagsterInstance.ephemeral()
+    instance.report_runless_asset_event(dg.AssetMaterialization("league_valuation_evolution_db"))
+    queries = WarehouseQueries(database=database, instance=instance)
+
+    first = queries.league_valuations(competition_ids=["GB1"])
+    second = queries.league_valuations(competition_ids=["GB1"])
+    assert first.column("total_valuation").to_pylist() == [100.0]
+    assert second is first
+    assert queries.stats == {"hits": 1, "misses": 1}
+
+    _write(database, "update league_valuation_evolution set total_valuation = 120.0 where domestic_competition_id = 'GB1';")
+    assert queries.league_valuations(competition_ids=["GB1"]) is first
+
+    instance.report_runless_asset_event(dg.AssetMaterialization("league_valuation_evolution_db"))
+    refreshed = queries.league_valuations(competition_ids=["GB1"])
+    assert refreshed.column("total_valuation").to_pylist() == [120.0]
+
+
+def test_queries_do_not_wait_for_a_running_write(tmp_path):
+    database = str(tmp_path / "data.duckdb")
+    _write(database, "create table league_valuation_evolution as select 'GB1' as domestic_competition_id, '2020-01-01' as partition_date;")
+    instance = dg.DagsterInstance.ephemeral()
+    queries = WarehouseQueries(database=database, instance=instance)
+    queries.league_valuations()
+
+    # A load holds the writer lock while a new materialization is recorded.
+    with _exclusive_file_lock(f"{database}.lock"):
+        _write(database, "insert into league_valuation_evolution values ('ES1', '2020-01-01');")
+        instance.report_runless_asset_event(dg.AssetMaterialization("league_valuation_evolution_db"))
+        assert queries.league_valuations().num_rows == 1
+
+    assert queries.league_valuations().num_rows == 2
+
+
+def test_no_players_give_an_empty_table(tmp_path):
+    database = str(tmp_path / "data.duckdb")
+    _write(database, "create table player_valuations as select 1 as player_id, date '2020-01-01' as date, 100.0 as market_value;")
+    queries = WarehouseQueries(database=database, instance=dg.DagsterInstance.ephemeral())
+
+    result = queries.player_valuations([])
+    assert result.num_rows == 0
+    assert result.column_names == ["player_id", "date", "market_value"]
@@ -0,0 +1,61 @@
+import threading
+
+import duckdb
+
+from dagster_essentials_football.defs.resources import SerializedDuckDBResource, _exclusive_file_lock
+
+
+def _count(resource: SerializedDuckDBResource) -> int:
+    with resource.get_read_connection() as conn:
+        return conn.execute("select count(*) from t").fetchone()[0]
+
+
+def test_readers_wait_for_a_running_load(tmp_path):
+    database = str(tmp_path / "data.duckdb")
+    with duckdb.connect(database) as conn:
+        conn.execute("create table t as select 1 as x;")
+    resource = SerializedDuckDBResource(database=database)
+    assert _count(resource) == 1
+
+    counts = []
+    with _exclusive_file_lock(f"{database}.lock"):
+        # A load holding the writer lock has changed the database.
+        with duckdb.connect(database) as conn:
+            conn.execute("insert into t values (2);")
+        reader = threading.Thread(target=lambda: counts.append(_count(resource)))
+        reader.start()
+        reader.join(timeout=0.5)
+        assert reader.is_alive()
+    reader.join(timeout=10)
+
+    # The reader saw the load's write, not the snapshot taken before it.
+    assert counts == [2]
+
+
+def test_a_copy_taken_during_a_write_is_not_used(tmp_path, monkeypatch):
+    from dagster_essentials_football.defs import resources
+
+    database = str(tmp_path / "data.duckdb")
+    with duckdb.connect(database) as conn:
+        conn.execute("create table t as select 1 as x;")
+    resource = SerializedDuckDBResource(database=database)
+    assert _count(resource) == 1
+    with duckdb.connect(database) as conn:
+        conn.execute("insert into t values (2);")
+
+    copy_database = resources._copy_database
+
+    def copy_during_a_write(*args):
+        copies = copy_database(*args)
+        with duckdb.connect(database) as conn:
+            conn.execute("insert into t values (3);")
+        return copies
+
+    monkeypatch.setattr(resources, "_copy_database", copy_during_a_write)
+    assert not resources.refresh_snapshot(database, blocking=False)
+    with duckdb.connect(f"{database}.snapshot", read_only=True) as conn:
+        assert conn.execute("select count(*) from t").fetchone()[0] == 1
+
+    monkeypatch.undo()
+    assert resources.refresh_snapshot(database, blocking=True)
+    assert _count(resource) == 3
@@ -0,0 +1,31 @@
+import csv
+
+from benchmarks.synthetic import generate
+from dagster_essentials_football.defs.assets import schemas
+
+CSV_SCHEMAS = {
+    "player_valuations.csv": schemas.PLAYER_VALUATIONS_SCHEMA,
+    "appearances.csv": schemas.PLAYER_APPEARANCES_SCHEMA,
+    "competitions.csv": schemas.COMPETITIONS_SCHEMA,
+    "players.csv": schemas.PLAYERS_SCHEMA,
+    "clubs.csv": schemas.CLUBS_SCHEMA,
+    "games.csv": schemas.GAMES_SCHEMA,
+}
+
+
+def test_synthetic_dataset_matches_the_schemas(tmp_path):
+    row_counts = generate(str(tmp_path), scale=0.001)
+
+    for file_name, schema in CSV_SCHEMAS.items():
+        with open(tmp_path / file_name, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == list(schema)
+        assert len(rows) - 1 == row_counts[file_name]
+
+
+def test_synthetic_dataset_is_deterministic(tmp_path):
+    generate(str(tmp_path / "first"), scale=0.001)
+    generate(str(tmp_path / "second"), scale=0.001)
+
+    for file_name in CSV_SCHEMAS:
+        assert (tmp_path / "first" / file_name).read_bytes() == (tmp_path / "second" / file_name).read_bytes()
@@ -0,0 +1,135 @@
+import base64
+import hashlib
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from dagster_essentials_football.defs.assets import constants
+
+PLOT_MODULE = "utils.plot"
+PLOT_SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plot.py")
+
+
+def _chart_hash(chart: dict) -> str:
+    """
+    Hashes everything a chart is drawn from: its data, its options, the files
+    it reads (logos) and the plotting code itself.
+    """
+    digest = hashlib.sha256()
+    digest.update(chart["plot"].encode())
+    digest.update(json.dumps(list(chart["data"].columns)).encode())
+    digest.update(pd.util.hash_pandas_object(chart["data"], index=False).values.tobytes())
+    digest.update(json.dumps(chart.get("options", {}), sort_keys=True, default=str).encode())
+    for path in sorted(set(chart.get("files", []))):
+        mtime = os.path.getmtime(path) if os.path.exists(path) else None
+        digest.update(f"{path}:{mtime}".encode())
+    with open(PLOT_SOURCE_PATH, "rb") as source:
+        digest.update(source.read())
+    return digest.hexdigest()
+
+
+def thumbnail_path(output_path: str) -> str:
+    root, extension = os.path.splitext(output_path)
+    return f"{root}.thumb{extension}"
+
+
+def _write_thumbnail(output_path: str) -> None:
+    """
+    Saves a downscaled, palette-reduced copy of a chart for previews.
+    """
+    from PIL import Image
+
+    with Image.open(output_path) as image:
+        image.thumbnail(constants.THUMBNAIL_SIZE)
+        thumbnail = image.convert("RGB").quantize(colors=constants.THUMBNAIL_COLORS)
+        thumbnail.save(thumbnail_path(output_path), optimize=True)
+
+
+def _render(plot: str, data: pd.DataFrame, options: dict, output_path: str) -> str:
+    """
+    Draws one chart and its thumbnail; runs in the pool workers as well as
+    inline.
+    """
+    import importlib
+
+    plot_fn = getattr(importlib.import_module(PLOT_MODULE), plot)
+    plot_fn(data, output_path=output_path, **options)
+    _write_thumbnail(output_path)
+    return output_path
+
+
+def preview_markdown(output_paths: list) -> str:
+    """
+    Markdown showing the thumbnails of the charts. Only the thumbnails are
+    inlined, so the metadata stays a few KB however large the charts are.
+    """
+    images = []
+    for output_path in output_paths:
+        with open(thumbnail_path(output_path), "rb") as f:
+            encoded = base64.b64encode(f.read()).decode("utf-8")
+        name = os.path.splitext(os.path.basename(output_path))[0]
+        images.append(f"![{name}](data:image/png;base64,{encoded})")
+    return "\n".join(images)
+
+
+def _pool_context():
+    """
+    Workers are forked from a server that imported the plotting stack once,
+    so they start without paying for matplotlib and seaborn again. Platforms
+    without fork servers spawn fresh interpreters.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([PLOT_MODULE])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def render_charts(charts: list, max_workers: int = 1) -> dict:
+    """
+    Renders charts given as dicts with `plot` (a function in utils.plot),
+    `data`, `output_path` and optionally `options` and `files`. A chart whose
+    inputs hash the same as on its last render is skipped. Every rendered
+    chart gets a thumbnail next to it (see `thumbnail_path`). With more than one
+    worker, the charts left to draw are rendered in parallel processes.
+
+    Returns {output_path: True if rendered, False if skipped}.
+    """
+    rendered = {}
+    pending = []
+    for chart in charts:
+        output_path = os.path.abspath(chart["output_path"])
+        hash_path = f"{output_path}.sha256"
+        chart_hash = _chart_hash(chart)
+
+        if all(os.path.exists(path) for path in [output_path, thumbnail_path(output_path), hash_path]):
+            with open(hash_path) as f:
+                if f.read() == chart_hash:
+                    rendered[chart["output_path"]] = False
+                    continue
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        pending.append((chart, output_path, hash_path, chart_hash))
+
+    jobs = [
+        (chart["plot"], chart["data"], chart.get("options", {}), output_path)
+        for chart, output_path, _, _ in pending
+    ]
+    if len(jobs) > 1 and max_workers > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(jobs)),
+            mp_context=_pool_context(),
+        ) as pool:
+            list(pool.map(_render, *zip(*jobs)))
+    else:
+        for job in jobs:
+            _render(*job)
+
+    for chart, _, hash_path, chart_hash in pending:
+        with open(hash_path, "w") as f:
+            f.write(chart_hash)
+        rendered[chart["output_path"]] = True
+
+    return rendered
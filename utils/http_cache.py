@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+
+class HttpCache:
+    """
+    Persistent on-disk cache of HTTP GET responses.
+
+    Entries younger than `ttl` seconds are served without a request. Older
+    entries are revalidated with a conditional request (ETag /
+    Last-Modified), so unchanged content is not downloaded again. A body
+    that does not match the content hash recorded with it is downloaded
+    again. When the cache grows beyond `max_bytes`, the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = 86400, max_bytes: int = 50_000_000):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return (
+            os.path.join(self.cache_dir, f"{key}.json"),
+            os.path.join(self.cache_dir, f"{key}.body"),
+        )
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def get(self, session: requests.Session, url: str, timeout: float) -> bytes:
+        meta_path, body_path = self._paths(url)
+
+        meta = None
+        if os.path.exists(meta_path) and os.path.exists(body_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+
+        if meta is not None and time.time() - meta["fetched_at"] < self.ttl:
+            content = self._read_body(meta_path, body_path, meta)
+            if content is not None:
+                self._count("hits")
+                return content
+            # The body does not match its metadata; download it again.
+            meta = None
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = session.get(url, headers=headers, timeout=timeout)
+
+        if meta is not None and response.status_code == 304:
+            content = self._read_body(meta_path, body_path, meta)
+            if content is not None:
+                self._count("revalidated")
+                meta["fetched_at"] = time.time()
+                self._write_file(meta_path, json.dumps(meta).encode())
+                return content
+            response = session.get(url, timeout=timeout)
+
+        response.raise_for_status()
+        self._count("misses")
+
+        content = response.content
+        self._write_file(body_path, content)
+        self._write_file(meta_path, json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": hashlib.sha256(content).hexdigest(),
+            "size": len(content),
+            "fetched_at": time.time(),
+        }).encode())
+
+        self.evict()
+        return content
+
+    def _read_body(self, meta_path: str, body_path: str, meta: dict):
+        """
+        Returns the cached body, or None if it is missing or does not match
+        the content hash in its metadata.
+        """
+        try:
+            with open(body_path, "rb") as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None
+        if hashlib.sha256(content).hexdigest() != meta.get("content_hash"):
+            return None
+        # Touch the entry so eviction sees it as recently used.
+        os.utime(meta_path)
+        return content
+
+    def _write_file(self, path: str, data: bytes) -> None:
+        # Written next to the entry and swapped in, so readers in other
+        # threads and processes never see a partial file.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def evict(self) -> None:
+        with self._lock:
+            entries = []
+            total_size = 0
+            for file_name in os.listdir(self.cache_dir):
+                if not file_name.endswith(".json"):
+                    continue
+                meta_path = os.path.join(self.cache_dir, file_name)
+                body_path = meta_path[:-len(".json")] + ".body"
+                try:
+                    size = os.path.getsize(body_path)
+                    last_used = os.path.getmtime(meta_path)
+                except OSError:
+                    continue
+                entries.append((last_used, size, meta_path, body_path))
+                total_size += size
+
+            for _, size, meta_path, body_path in sorted(entries):
+                if total_size <= self.max_bytes:
+                    break
+                for path in (meta_path, body_path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total_size -= size
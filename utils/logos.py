@@ -0,0 +1,148 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.http_cache import HttpCache
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+
+
+class LogoNotFoundError(Exception):
+    pass
+
+
+def build_session(max_workers: int = 8, retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+    """
+    Creates a session whose connection pool is shared by all worker threads and
+    that retries failed requests with exponential backoff.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=max_workers,
+        pool_maxsize=max_workers,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def find_logo_url(html: str, page_url: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    logo_container = soup.find("div", class_="data-header__profile-container")
+
+    if not logo_container:
+        raise LogoNotFoundError("Konnte den Logo-Container (div.data-header__profile-container) nicht finden. Die Seitenstruktur hat sich möglicherweise geändert.")
+
+    logo_img_tag = logo_container.find("img")
+
+    if not logo_img_tag:
+        raise LogoNotFoundError("Logo-Container gefunden, aber kein <img>-Tag darin.")
+
+    image_url = logo_img_tag.get("src")
+
+    if not image_url:
+        raise LogoNotFoundError("<img>-Tag gefunden, aber es hat kein 'src'-Attribut.")
+
+    return urljoin(page_url, str(image_url))
+
+
+def _get(session: requests.Session, url: str, timeout: float, cache: HttpCache = None) -> bytes:
+    if cache is not None:
+        return cache.get(session, url, timeout)
+
+    response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_logo(
+    session: requests.Session,
+    url: str,
+    image_path: str,
+    timeout: float,
+    cache: HttpCache = None,
+) -> bool:
+    """
+    Downloads the logo of one competition page and returns whether the file
+    on disk changed. An unchanged image is not rewritten.
+    """
+    page = _get(session, url, timeout, cache)
+    image_url = find_logo_url(page.decode("utf-8", errors="replace"), url)
+    image = _get(session, image_url, timeout, cache)
+
+    if os.path.exists(image_path):
+        with open(image_path, "rb") as img_file:
+            if img_file.read() == image:
+                return False
+
+    with open(image_path, "wb") as img_file:
+        img_file.write(image)
+    return True
+
+
+def fetch_logos(
+    competitions: list,
+    image_path_template: str,
+    max_workers: int = 8,
+    timeout: float = 10,
+    retries: int = 3,
+    backoff_factor: float = 0.5,
+    cache: HttpCache = None,
+) -> dict:
+    """
+    Downloads the logo of every (competition_id, url) pair with at most
+    `max_workers` concurrent requests. Without a cache, logos already on disk
+    are skipped. A failing competition does not stop the others; its error
+    is returned under "failures".
+    """
+    pending = []
+    skipped = []
+    for competition_id, url in competitions:
+        image_path = image_path_template.format(competition_id)
+        if cache is None and os.path.exists(image_path):
+            skipped.append(competition_id)  # Logo already exists, skip downloading
+        else:
+            pending.append((competition_id, url, image_path))
+
+    fetched = []
+    unchanged = []
+    failures = {}
+
+    with build_session(max_workers, retries, backoff_factor) as session:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                competition_id: executor.submit(fetch_logo, session, url, image_path, timeout, cache)
+                for competition_id, url, image_path in pending
+            }
+
+            for competition_id, future in futures.items():
+                try:
+                    if future.result():
+                        fetched.append(competition_id)
+                    else:
+                        unchanged.append(competition_id)
+                except (requests.exceptions.RequestException, LogoNotFoundError, OSError) as e:
+                    failures[competition_id] = str(e)
+
+    return {
+        "fetched": fetched,
+        "unchanged": unchanged,
+        "skipped": skipped,
+        "failures": failures,
+    }
@@ -0,0 +1,43 @@
+import re
+import sys
+
+_PROC_STATUS = "/proc/self/status"
+_PROC_CLEAR_REFS = "/proc/self/clear_refs"
+
+
+def reset_peak_rss() -> bool:
+    """
+    Resets the peak resident set size of this process, so the next
+    `peak_rss_bytes()` only covers what ran in between. Only Linux supports
+    this; elsewhere the peak stays the lifetime peak and False is returned.
+    """
+    try:
+        with open(_PROC_CLEAR_REFS, "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes() -> int:
+    """
+    Returns the peak resident set size of this process in bytes, including
+    memory allocated natively by DuckDB and Arrow.
+    """
+    try:
+        with open(_PROC_STATUS) as status:
+            match = re.search(r"VmHWM:\s+(\d+) kB", status.read())
+        if match:
+            return int(match.group(1)) * 1024
+    except OSError:
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        # Windows has neither /proc nor getrusage.
+        return 0
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
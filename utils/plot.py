@@ -1,19 +1,55 @@
+import functools
 import os
-import matplotlib
-matplotlib.use("Agg")
 
-import matplotlib.pyplot as plt
+import matplotlib
+import matplotlib.patches as mpatches
+from matplotlib.figure import Figure
 from matplotlib.ticker import FuncFormatter
-import matplotlib.image as mpimg
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+import numpy as np
+from PIL import Image
 from dagster_essentials_football.defs.assets import constants
 import seaborn as sns
 import pandas as pd
 
-def plot_leagues(yearly_data_total: pd.DataFrame, 
-                 groupby_columns= ['league_label', 'domestic_competition_id'], 
-                 statistic='total_valuation', 
-                 output_path="first_league_valuation_evolution.png",
+# Figures are built with the object-oriented API and never registered with
+# pyplot, so they are freed as soon as they are saved.
+
+
+@functools.lru_cache(maxsize=constants.LOGO_CACHE_SIZE)
+def _load_logo(path: str, mtime: float, height: int) -> np.ndarray:
+    """
+    Decodes a logo and scales it to `height` pixels. Cached per file
+    version, so a logo is decoded once per process.
+    """
+    with Image.open(path) as image:
+        image = image.convert("RGBA")
+        width = max(1, round(image.width * height / image.height))
+        return np.asarray(image.resize((width, height), Image.LANCZOS))
+
+
+def league_logo(competition_id, logos_path: str, height: int = constants.LOGO_HEIGHT_PX):
+    """
+    Returns the scaled logo of a league from the `logos_path` template, the
+    default logo if it has none, or None if neither exists.
+    """
+    for path in [
+        logos_path.format(competition_id),
+        logos_path.format("default"),
+    ]:
+        try:
+            mtime = os.path.getmtime(path)
+        except FileNotFoundError:
+            continue
+        return _load_logo(path, mtime, height)
+    return None
+
+
+def plot_leagues(yearly_data_total: pd.DataFrame,
+                 output_path: str,
+                 logos_path: str,
+                 groupby_columns= ['league_label', 'domestic_competition_id'],
+                 statistic='total_valuation',
                  set_ylabel='Total Valuation (EUR)',
                  set_xlabel='Year',
                  set_title='First League Valuation Evolution Over Time',
@@ -25,10 +61,11 @@ def plot_leagues(yearly_data_total: pd.DataFrame,
     sorted_labels = league_max_vals['league_label'].tolist()
     sorted_ids = league_max_vals['domestic_competition_id'].tolist()
 
-    fig, ax = plt.subplots(figsize=(12, 8))
+    fig = Figure(figsize=(12, 8))
+    ax = fig.subplots()
     colors = sns.color_palette("tab10", n_colors=len(sorted_labels))
     color_map = dict(zip(sorted_labels, colors))
-    
+
     sns.lineplot(
         data=yearly_data_total,
         x='year',
@@ -38,12 +75,11 @@ def plot_leagues(yearly_data_total: pd.DataFrame,
         palette=color_map,
         marker='o',
         ax=ax,
-        legend=False                    
+        legend=False
     )
 
     Y_START = 0.95  # Obere Position der Legende (95% von oben)
     Y_STEP = 0.12   # Vertikaler Abstand zwischen den Einträgen
-    IMG_ZOOM = 0.2  # Bildgröße (muss angepasst werden)
     TEXT_X_OFFSET = 1.08 # X-Position des Texts (rechts neben dem Bild)
 
     fig.subplots_adjust(right=0.75)
@@ -51,26 +87,17 @@ def plot_leagues(yearly_data_total: pd.DataFrame,
     for i, (label, competition_id) in enumerate(zip(sorted_labels, sorted_ids)):
 
         y_pos = Y_START - (i * Y_STEP)
-        
-        img = None
-        try:
-            img_path = constants.LEAGUE_LOGOS_PATH.format(competition_id)
-            img = mpimg.imread(img_path)
-        except FileNotFoundError:
-            try:
-                img_path = constants.LEAGUE_LOGOS_PATH.format("default")
-                img = mpimg.imread(img_path)
-            except FileNotFoundError:
-                pass
-        
+
+        img = league_logo(competition_id, logos_path)
         if img is not None:
-            imagebox = OffsetImage(img, zoom=IMG_ZOOM)
+            # The logo is already scaled, so it is drawn at its pixel size.
+            imagebox = OffsetImage(img, zoom=1, dpi_cor=False)
             ab = AnnotationBbox(
                 imagebox,
                 (1.02, y_pos),
                 xycoords='axes fraction',
                 frameon=False,
-                box_alignment=(0.0, 0.5) 
+                box_alignment=(0.0, 0.5)
             )
             ax.add_artist(ab)
 
@@ -79,22 +106,56 @@ def plot_leagues(yearly_data_total: pd.DataFrame,
             y_pos,
             label,
             color=color_map[label],
-            transform=ax.transAxes, 
+            transform=ax.transAxes,
             fontsize=10,
             verticalalignment='center'
         )
 
-    ax.set_xlabel(set_xlabel) 
+    ax.set_xlabel(set_xlabel)
     ax.set_ylabel(set_ylabel)
     ax.set_title(set_title)
 
-    
+
     unit = "B" if step >= 1_000_000_000 else "M" if step >= 1_000_000 else "K"
     formatter = FuncFormatter(lambda x, pos: f'{x / step:.0f}{unit}')
     ax.yaxis.set_major_formatter(formatter)
 
+    fig.savefig(output_path, bbox_inches='tight')
+
+    return output_path
+
+
+def plot_top_players(top_players: pd.DataFrame,
+                     output_path: str,
+                     ):
+    """
+    Horizontal bars of the players' average valuations, coloured by club.
+    Expects the columns name, avg_valuation and club_name, best player first.
+    """
+    names = top_players['name'].tolist()[::-1]
+    avg_valuations = top_players['avg_valuation'].tolist()[::-1]
+    club_names = top_players['club_name'].tolist()[::-1]
+    unique_clubs = list(dict.fromkeys(top_players['club_name'].tolist()))
+
+    cmap = matplotlib.colormaps['tab20'].resampled(max(len(unique_clubs), 1))
+    color_map = {club: cmap(i) for i, club in enumerate(unique_clubs)}
+    colors = [color_map[club] for club in club_names]
+    fig = Figure(figsize=(12, 30))
+    ax = fig.subplots()
+
+    ax.barh(names, avg_valuations, color=colors)
+
+    ax.set_xlabel('Average Valuation (EUR)')
+    ax.set_title('Top 100 Players by Average Valuation')
+
+    formatter = FuncFormatter(lambda x, pos: f'{x / 1_000_000:.0f}M')
+    ax.xaxis.set_major_formatter(formatter)
+
+    ax.tick_params(axis='y', labelsize=8)
+    patches = [mpatches.Patch(color=color_map[club], label=club) for club in unique_clubs]
+    ax.legend(handles=patches, bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout()
 
-    output_path = os.path.join("data/outputs/", output_path)
-    plt.savefig(output_path, bbox_inches='tight')
+    fig.savefig(output_path, bbox_inches='tight')
 
-    return output_path
\ No newline at end of file
+    return output_path